@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import atexit
 import os
+import threading
 from dataclasses import dataclass
 from datetime import datetime, timezone
 from typing import Any, Dict, Optional, Sequence, Tuple
@@ -33,6 +35,93 @@ def get_mongo_config(
     return MongoConfig(uri=uri, db=db)
 
 
+# Day format used by the EIA / NOAA scripts for string-stored dates.
+_ISO_DAY = "%Y-%m-%d"
+
+_CLIENTS: Dict[str, MongoClient] = {}
+_CLIENTS_LOCK = threading.Lock()
+
+
+def _get_client(uri: str) -> MongoClient:
+    """
+    Return a shared MongoClient for `uri`.
+
+    MongoClient is thread-safe and pools connections internally, so loaders
+    reuse one client per URI instead of reconnecting (TCP/TLS, discovery,
+    auth) on every call. Clients are closed at interpreter exit.
+    """
+    client = _CLIENTS.get(uri)
+    if client is None:
+        with _CLIENTS_LOCK:
+            client = _CLIENTS.get(uri)
+            if client is None:
+                client = MongoClient(uri, maxPoolSize=50, serverSelectionTimeoutMS=5000)
+                _CLIENTS[uri] = client
+    return client
+
+
+@atexit.register
+def _close_clients() -> None:
+    with _CLIENTS_LOCK:
+        for client in _CLIENTS.values():
+            client.close()
+        _CLIENTS.clear()
+
+
+def _parse_bound(s: str, date_is_string: bool) -> str | datetime:
+    """
+    Convert a start/end filter value to the type stored in the collection.
+
+    Collections written by the EIA / NOAA scripts keep dates as 'YYYY-MM-DD'
+    strings; others store BSON dates, which must be compared as datetimes
+    so the range can use the date index.
+    """
+    if date_is_string:
+        return s
+    return _to_utc_dt(s)
+
+
+def _date_range_query(
+    field: str,
+    start: str | None,
+    end: str | None,
+    date_is_string: bool,
+) -> dict[str, Any]:
+    query: dict[str, Any] = {}
+    if start or end:
+        query[field] = {}
+        if start:
+            query[field]["$gte"] = _parse_bound(start, date_is_string)
+        if end:
+            query[field]["$lte"] = _parse_bound(end, date_is_string)
+    return query
+
+
+def _projected_columns(
+    projection: Optional[Dict[str, int]],
+) -> Optional[list[str]]:
+    """
+    Column list for a plain inclusion projection, else None.
+
+    Exclusion projections and dotted paths can't be mapped to top-level
+    keys up front, so callers fall back to building from whole documents.
+    """
+    if not projection:
+        return None
+
+    columns = []
+    for field, include in projection.items():
+        if field == "_id":
+            continue
+        if not include or "." in field:
+            return None
+        columns.append(field)
+
+    if projection.get("_id", 1):
+        columns.insert(0, "_id")
+    return columns or None
+
+
 def load_mongo_df(
     *,
     collection: str,
@@ -40,8 +129,11 @@ def load_mongo_df(
     projection: Optional[Dict[str, int]] = None,
     sort: Optional[Sequence[Tuple[str, int]]] = None,
     limit: Optional[int] = None,
+    batch_size: int = 1000,
     date_col: str = "date",
     parse_dates: bool = True,
+    date_format: str | None = None,
+    prefer_native_date: bool = True,
     drop_mongo_id: bool = True,
     mongo_uri: str | None = None,
     mongo_db: str | None = None,
@@ -62,10 +154,18 @@ def load_mongo_df(
         Optional list of (field, direction), e.g. [("date", 1)]
     limit:
         Optional maximum docs to return.
+    batch_size:
+        Documents per cursor batch (network round-trip).
     date_col:
         Column to parse as dates if parse_dates=True.
     parse_dates:
         If True, convert date_col to pandas datetime.
+    date_format:
+        strptime format for string-stored dates (e.g. "%Y-%m-%d"); avoids
+        per-element format inference.
+    prefer_native_date:
+        If True, keep date_col as-is when it already decoded from BSON
+        dates to datetime64.
     drop_mongo_id:
         If True, drop "_id" if present.
 
@@ -74,34 +174,47 @@ def load_mongo_df(
     pd.DataFrame
     """
     cfg = get_mongo_config(mongo_uri=mongo_uri, mongo_db=mongo_db)
-    client = MongoClient(cfg.uri)
-    try:
-        col = client[cfg.db][collection]
+    col = _get_client(cfg.uri)[cfg.db][collection]
 
-        q = query or {}
-        cursor = col.find(q, projection)
+    q = query or {}
+    cursor = col.find(q, projection)
 
-        if sort:
-            cursor = cursor.sort(list(sort))
-        if limit:
-            cursor = cursor.limit(int(limit))
+    if sort:
+        cursor = cursor.sort(list(sort))
+    if limit:
+        cursor = cursor.limit(int(limit))
+    cursor = cursor.batch_size(int(batch_size))
 
+    columns = _projected_columns(projection)
+    if columns is None:
         docs = list(cursor)
         if not docs:
             return pd.DataFrame()
-
         df = pd.DataFrame(docs)
+    else:
+        # Fixed schema: fill one list per column straight from the cursor
+        # rather than keeping every document dict around for pandas to
+        # re-scan during inference.
+        data: Dict[str, list] = {c: [] for c in columns}
+        appenders = [(c, data[c].append) for c in columns]
+        for doc in cursor:
+            for c, append in appenders:
+                append(doc.get(c))
+        if not data[columns[0]]:
+            return pd.DataFrame()
+        df = pd.DataFrame(data, columns=columns)
 
-        if drop_mongo_id and "_id" in df.columns:
-            df = df.drop(columns=["_id"])
+    if drop_mongo_id and "_id" in df.columns:
+        df = df.drop(columns=["_id"])
 
-        if parse_dates and date_col in df.columns:
-            df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
+    if parse_dates and date_col in df.columns:
+        dates = df[date_col]
+        if not (prefer_native_date and pd.api.types.is_datetime64_any_dtype(dates)):
+            df[date_col] = pd.to_datetime(
+                dates, format=date_format, errors="coerce", cache=True
+            )
 
-        return df
-
-    finally:
-        client.close()
+    return df
 
 
 def load_henry_hub_daily(
@@ -110,6 +223,7 @@ def load_henry_hub_daily(
     end: str | None = None,
     mongo_uri: str | None = None,
     mongo_db: str | None = None,
+    date_is_string: bool = True,
 ) -> pd.DataFrame:
     """
     Convenience loader for Henry Hub spot prices stored by your script.
@@ -117,13 +231,7 @@ def load_henry_hub_daily(
     Collection: eia_hh_spot_daily
     Fields: date, value, units, series
     """
-    query: Dict[str, Any] = {}
-    if start or end:
-        query["date"] = {}
-        if start:
-            query["date"]["$gte"] = start
-        if end:
-            query["date"]["$lte"] = end
+    query = _date_range_query("date", start, end, date_is_string)
 
     df = load_mongo_df(
         collection="eia_hh_spot_daily",
@@ -131,6 +239,7 @@ def load_henry_hub_daily(
         projection={"_id": 0, "date": 1, "value": 1, "units": 1, "series": 1},
         sort=[("date", 1)],
         date_col="date",
+        date_format=_ISO_DAY if date_is_string else None,
         mongo_uri=mongo_uri,
         mongo_db=mongo_db,
     )
@@ -147,6 +256,7 @@ def load_storage_weekly(
     region: str | None = None,
     mongo_uri: str | None = None,
     mongo_db: str | None = None,
+    date_is_string: bool = True,
 ) -> pd.DataFrame:
     """
     Convenience loader for EIA working gas in storage (weekly).
@@ -154,13 +264,7 @@ def load_storage_weekly(
     Collection: eia_storage_weekly
     Fields: date, value, units, series, region
     """
-    query: Dict[str, Any] = {}
-    if start or end:
-        query["date"] = {}
-        if start:
-            query["date"]["$gte"] = start
-        if end:
-            query["date"]["$lte"] = end
+    query = _date_range_query("date", start, end, date_is_string)
     if region:
         query["region"] = region
 
@@ -177,6 +281,7 @@ def load_storage_weekly(
         },
         sort=[("date", 1)],
         date_col="date",
+        date_format=_ISO_DAY if date_is_string else None,
         mongo_uri=mongo_uri,
         mongo_db=mongo_db,
     )
@@ -194,6 +299,7 @@ def load_noaa_region_daily(
     region_id: str | None = None,
     mongo_uri: str | None = None,
     mongo_db: str | None = None,
+    date_is_string: bool = True,
 ) -> pd.DataFrame:
     """
     Load daily NOAA regional HDD data for a given pipeline.
@@ -217,19 +323,16 @@ def load_noaa_region_daily(
         Optional date filters (YYYY-MM-DD)
     region_id:
         Optional region identifier (if you store multiple regions per pipeline)
+    date_is_string:
+        True when `date` is stored as a 'YYYY-MM-DD' string (current NOAA
+        script); False to compare against BSON dates.
 
     Returns
     -------
     pd.DataFrame sorted by date
     """
     query: dict[str, Any] = {"pipeline": pipeline}
-
-    if start or end:
-        query["date"] = {}
-        if start:
-            query["date"]["$gte"] = start
-        if end:
-            query["date"]["$lte"] = end
+    query.update(_date_range_query("date", start, end, date_is_string))
 
     if region_id:
         query["region_id"] = region_id
@@ -249,6 +352,7 @@ def load_noaa_region_daily(
         },
         sort=[("date", 1)],
         date_col="date",
+        date_format=_ISO_DAY if date_is_string else None,
         mongo_uri=mongo_uri,
         mongo_db=mongo_db,
     )
@@ -263,6 +367,7 @@ def load_capacity_df(
     end: str | None = None,
     mongo_uri: str | None = None,
     mongo_db: str | None = None,
+    date_is_string: bool = True,
     limit: int | None = None,
 ) -> pd.DataFrame:
     """
@@ -273,14 +378,7 @@ def load_capacity_df(
 
     Filters by Post_Date if provided.
     """
-    query: dict[str, Any] = {}
-
-    if start or end:
-        query["Post_Date"] = {}
-        if start:
-            query["Post_Date"]["$gte"] = start
-        if end:
-            query["Post_Date"]["$lte"] = end
+    query = _date_range_query("Post_Date", start, end, date_is_string)
 
     df = load_mongo_df(
         collection=collection,
@@ -332,28 +430,60 @@ def load_capacity_df(
     return df
 
 
-def _to_utc_dt(s: str) -> datetime:
-    """
-    Convert 'YYYY-MM-DD' or ISO string to timezone-aware UTC datetime.
-    """
-    ts = pd.to_datetime(s, utc=True, errors="raise")
-    return ts.to_pydatetime()
-
-
-def load_notices_df(
+def load_capacity_slim(
     *,
     collection: str,
     start: str | None = None,
     end: str | None = None,
+    fields: Sequence[str] = ("Post_Date", "All_Qty_Avail"),
     mongo_uri: str | None = None,
     mongo_db: str | None = None,
-    limit: int | None = None,
-    only_active: bool = False,
+    date_is_string: bool = True,
+    batch_size: int = 10_000,
 ) -> pd.DataFrame:
     """
-    Load notices from a pipeline-specific notices collection.
+    Load only `fields` from a capacity collection.
 
-    posted_dt is stored as BSON Date (ISODate), so start/end must be datetimes.
+    Use instead of load_capacity_df when a feature needs a couple of columns;
+    it skips the wide projection and server-side sort.
+
+    Adds Post_Date_dt when Post_Date is among the fields.
+    """
+    df = load_mongo_df(
+        collection=collection,
+        query=_date_range_query("Post_Date", start, end, date_is_string),
+        projection={"_id": 0, **{f: 1 for f in fields}},
+        batch_size=batch_size,
+        parse_dates=False,
+        mongo_uri=mongo_uri,
+        mongo_db=mongo_db,
+    )
+
+    if not df.empty and "Post_Date" in df.columns:
+        df["Post_Date_dt"] = pd.to_datetime(df["Post_Date"], errors="coerce")
+
+    return df
+
+
+def _to_utc_dt(s: str) -> datetime:
+    """
+    Convert 'YYYY-MM-DD' or ISO string to timezone-aware UTC datetime.
+
+    Naive inputs are treated as UTC. Non-ISO strings fall back to pandas.
+    """
+    try:
+        dt = datetime.fromisoformat(s)
+    except ValueError:
+        return pd.to_datetime(s, utc=True, errors="raise").to_pydatetime()
+
+    if dt.tzinfo is None:
+        return dt.replace(tzinfo=timezone.utc)
+    return dt.astimezone(timezone.utc)
+
+
+def _posted_dt_query(start: str | None, end: str | None) -> dict[str, Any]:
+    """
+    Build a posted_dt range filter for notices collections.
     """
     query: dict[str, Any] = {}
 
@@ -363,11 +493,31 @@ def load_notices_df(
             query["posted_dt"]["$gte"] = _to_utc_dt(start)
         if end:
             # inclusive end-of-day behavior:
-            end_dt = pd.to_datetime(end, utc=True).to_pydatetime()
+            end_dt = _to_utc_dt(end)
             # Move to end of that day (23:59:59.999) in UTC
             end_dt = end_dt.replace(hour=23, minute=59, second=59, microsecond=999000)
             query["posted_dt"]["$lte"] = end_dt
 
+    return query
+
+
+def load_notices_df(
+    *,
+    collection: str,
+    start: str | None = None,
+    end: str | None = None,
+    mongo_uri: str | None = None,
+    mongo_db: str | None = None,
+    limit: int | None = None,
+    only_active: bool = False,
+) -> pd.DataFrame:
+    """
+    Load notices from a pipeline-specific notices collection.
+
+    posted_dt is stored as BSON Date (ISODate), so start/end must be datetimes.
+    """
+    query = _posted_dt_query(start, end)
+
     if only_active:
         now_utc = datetime.now(timezone.utc)
         query["$or"] = [{"end_dt": None}, {"end_dt": {"$gte": now_utc}}]
@@ -412,3 +562,114 @@ def load_notices_df(
     df["end_dt"] = pd.to_datetime(df.get("end_dt"), utc=True, errors="coerce")
 
     return df
+
+
+def load_notice_daily_agg(
+    *,
+    collection: str,
+    start: str | None = None,
+    end: str | None = None,
+    mongo_uri: str | None = None,
+    mongo_db: str | None = None,
+) -> pd.DataFrame:
+    """
+    Expand notices to one row per active day and aggregate server-side.
+
+    Mirrors the pandas expansion in build_model_frame: effective_dt falls back
+    to posted_dt, end_dt falls back to effective_dt, and both bounds are
+    truncated to the UTC day. Only the daily rows come back over the wire.
+
+    Requires MongoDB >= 5.0 ($dateTrunc / $dateDiff / $dateAdd).
+
+    Returns
+    -------
+    pd.DataFrame with columns: date, notice_active_count, critical_active
+    """
+    pipeline: list[dict[str, Any]] = []
+
+    query = _posted_dt_query(start, end)
+    if query:
+        pipeline.append({"$match": query})
+
+    pipeline += [
+        {
+            "$project": {
+                "_id": 0,
+                "notice_id": 1,
+                "critical": 1,
+                "start_day": {
+                    "$dateTrunc": {
+                        "date": {"$ifNull": ["$effective_dt", "$posted_dt"]},
+                        "unit": "day",
+                    }
+                },
+                "end_day": {
+                    "$dateTrunc": {
+                        "date": {"$ifNull": ["$end_dt", "$effective_dt", "$posted_dt"]},
+                        "unit": "day",
+                    }
+                },
+            }
+        },
+        {"$match": {"start_day": {"$ne": None}}},
+        {
+            "$project": {
+                "notice_id": 1,
+                "critical": 1,
+                "start_day": 1,
+                "offset": {
+                    "$range": [
+                        0,
+                        {
+                            "$add": [
+                                1,
+                                {
+                                    "$dateDiff": {
+                                        "startDate": "$start_day",
+                                        "endDate": "$end_day",
+                                        "unit": "day",
+                                    }
+                                },
+                            ]
+                        },
+                    ]
+                },
+            }
+        },
+        {"$unwind": "$offset"},
+        {
+            "$group": {
+                "_id": {
+                    "$dateAdd": {
+                        "startDate": "$start_day",
+                        "unit": "day",
+                        "amount": "$offset",
+                    }
+                },
+                "notice_ids": {"$addToSet": "$notice_id"},
+                "critical_active": {"$max": {"$cond": ["$critical", 1, 0]}},
+            }
+        },
+        {
+            "$project": {
+                "_id": 0,
+                "date": "$_id",
+                "notice_active_count": {
+                    "$size": {"$setDifference": ["$notice_ids", [None]]}
+                },
+                "critical_active": 1,
+            }
+        },
+        {"$sort": {"date": 1}},
+    ]
+
+    cfg = get_mongo_config(mongo_uri=mongo_uri, mongo_db=mongo_db)
+    col = _get_client(cfg.uri)[cfg.db][collection]
+
+    docs = list(col.aggregate(pipeline))
+    if not docs:
+        return pd.DataFrame(columns=["date", "notice_active_count", "critical_active"])
+
+    df = pd.DataFrame(docs, columns=["date", "notice_active_count", "critical_active"])
+    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    return df
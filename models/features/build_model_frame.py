@@ -1,16 +1,19 @@
 from __future__ import annotations
 
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
 import numpy as np
 import pandas as pd
 from data.mongo import (
-    load_capacity_df,
+    load_capacity_slim,
     load_henry_hub_daily,
     load_noaa_region_daily,
+    load_notice_daily_agg,
     load_notices_df,
     load_storage_weekly,
 )
+from pymongo.errors import OperationFailure
 
 
 @dataclass(frozen=True)
@@ -24,9 +27,13 @@ class ModelFrameConfig:
 
 
 def _ensure_daily_index(df: pd.DataFrame, date_col: str = "date") -> pd.DataFrame:
-    df = df.copy()
-    df[date_col] = pd.to_datetime(df[date_col], errors="coerce")
-    df = df.dropna(subset=[date_col]).sort_values(date_col)
+    dates = df[date_col]
+    # Loaders already parse dates; only fall back to parsing raw values.
+    if not pd.api.types.is_datetime64_any_dtype(dates):
+        dates = pd.to_datetime(dates, format="ISO8601", cache=True, errors="coerce")
+
+    mask = dates.notna()
+    df = df.loc[mask].assign(**{date_col: dates[mask]}).sort_values(date_col)
     df = df.drop_duplicates(subset=[date_col], keep="last")
     return df
 
@@ -46,10 +53,12 @@ def _build_stress_from_notices(notices: pd.DataFrame) -> pd.DataFrame:
             columns=["date", "notice_active_count", "critical_active", "stress_event"]
         )
 
-    n = notices.copy()
-
     # Expect these columns after load_notices_df parsing:
     # posted_dt, effective_dt, end_dt, critical
+    # Work on just those (plus notice_id) rather than copying every field.
+    n = notices.reindex(
+        columns=["notice_id", "posted_dt", "effective_dt", "end_dt", "critical"]
+    )
     n["effective_dt"] = pd.to_datetime(n.get("effective_dt"), utc=True, errors="coerce")
     n["end_dt"] = pd.to_datetime(n.get("end_dt"), utc=True, errors="coerce")
     n["posted_dt"] = pd.to_datetime(n.get("posted_dt"), utc=True, errors="coerce")
@@ -62,17 +71,21 @@ def _build_stress_from_notices(notices: pd.DataFrame) -> pd.DataFrame:
     n["end_dt"] = n["end_dt"].fillna(n["effective_dt"])
 
     # Make date-only bounds for daily expansion
-    start_date = n["effective_dt"].dt.floor("D")
-    end_date = n["end_dt"].dt.floor("D")
+    n = n.dropna(subset=["effective_dt"])
+    start_day = n["effective_dt"].dt.tz_localize(None).to_numpy("datetime64[D]")
+    end_day = n["end_dt"].dt.tz_localize(None).to_numpy("datetime64[D]")
 
-    # Expand to daily rows (vectorized-ish using explode)
-    n = n.assign(
-        date_range=[pd.date_range(s, e, freq="D") for s, e in zip(start_date, end_date)]
-    )
-    daily = n.explode("date_range").rename(columns={"date_range": "date"})
+    # Expand to daily rows: repeat each notice once per active day, then
+    # offset each repeat by its position within the notice's span.
+    spans = np.maximum((end_day - start_day).astype(np.int64) + 1, 0)
+    row_idx = np.repeat(np.arange(len(n)), spans)
+    within = np.arange(spans.sum()) - np.repeat(np.cumsum(spans) - spans, spans)
+
+    daily = n.iloc[row_idx].reset_index(drop=True)
+    dates = start_day[row_idx] + within.astype("timedelta64[D]")
+    daily["date"] = dates.astype("datetime64[ns]")
 
     # Aggregate daily features
-    daily["date"] = pd.to_datetime(daily["date"]).dt.tz_localize(None)
     daily["critical"] = daily.get("critical", False).fillna(False).astype(bool)
 
     out = (
@@ -96,17 +109,102 @@ def _weekly_to_daily_ffill(
     if weekly.empty:
         return weekly
 
-    w = weekly.copy()
-    w[date_col] = pd.to_datetime(w[date_col], errors="coerce")
+    w = weekly[[date_col, *value_cols]].assign(
+        **{date_col: pd.to_datetime(weekly[date_col], errors="coerce")}
+    )
     w = w.dropna(subset=[date_col]).sort_values(date_col)
+    if w.empty:
+        return w
+
+    weekly_days = w[date_col].to_numpy("datetime64[D]")
+    days = np.arange(weekly_days[0], weekly_days[-1] + 1)
+
+    # For each day, gather the latest weekly sample at or before it
+    # (per column, skipping missing values like ffill does).
+    out = {"date": days.astype("datetime64[ns]")}
+    for col in value_cols:
+        vals = w[col].to_numpy(dtype=float)
+        ok = ~np.isnan(vals)
+        idx = np.searchsorted(weekly_days[ok], days, side="right") - 1
+        filled = np.full(len(days), np.nan)
+        filled[idx >= 0] = vals[ok][idx[idx >= 0]]
+        out[col] = filled
+
+    return pd.DataFrame(out)
+
+
+def _daily_median(dates: pd.Series, values: pd.Series, name: str) -> pd.DataFrame:
+    """
+    Median of `values` per calendar day of `dates`, skipping missing entries.
 
-    w = w.set_index(date_col)[value_cols].sort_index()
-    # Daily reindex to full range
-    daily_index = pd.date_range(w.index.min(), w.index.max(), freq="D")
-    w_daily = w.reindex(daily_index).ffill()
-    w_daily.index.name = "date"
-    w_daily = w_daily.reset_index()
-    return w_daily
+    Sorting by (day, value) once puts each day's values in order, so the
+    median is read from the middle of each run without a per-group sort.
+    """
+    day = dates.to_numpy("datetime64[D]")
+    vals = values.to_numpy(dtype=float)
+    ok = ~np.isnat(day) & ~np.isnan(vals)
+    day, vals = day[ok], vals[ok]
+    if len(vals) == 0:
+        return pd.DataFrame(columns=["date", name])
+
+    order = np.lexsort((vals, day))
+    day, vals = day[order], vals[order]
+    days, starts, counts = np.unique(day, return_index=True, return_counts=True)
+    med = 0.5 * (vals[starts + (counts - 1) // 2] + vals[starts + counts // 2])
+
+    return pd.DataFrame({"date": days.astype("datetime64[ns]"), name: med})
+
+
+def _left_align(
+    calendar: np.ndarray, dates: np.ndarray, values: np.ndarray
+) -> np.ndarray:
+    """
+    Left-join `values` onto `calendar` by exact date match.
+
+    `dates` must be sorted ascending and unique; days with no match are NaN.
+    """
+    out = np.full(len(calendar), np.nan)
+    if len(dates) == 0:
+        return out
+
+    idx = np.searchsorted(dates, calendar)
+    idx_c = np.minimum(idx, len(dates) - 1)
+    hit = (idx < len(dates)) & (dates[idx_c] == calendar)
+    out[hit] = values[idx_c[hit]]
+    return out
+
+
+def _load_stress_daily(
+    cfg: ModelFrameConfig,
+    mongo_uri: str | None = None,
+    mongo_db: str | None = None,
+) -> pd.DataFrame:
+    """
+    Daily stress signal from the notices collection.
+
+    Daily expansion runs server-side; fall back to pandas on servers that
+    lack the $dateTrunc/$dateDiff operators.
+    """
+    try:
+        stress_daily = load_notice_daily_agg(
+            collection=cfg.notices_collection,
+            start=cfg.start,
+            end=cfg.end,
+            mongo_uri=mongo_uri,
+            mongo_db=mongo_db,
+        )
+    except OperationFailure:
+        notices = load_notices_df(
+            collection=cfg.notices_collection,
+            start=cfg.start,
+            end=cfg.end,
+            mongo_uri=mongo_uri,
+            mongo_db=mongo_db,
+        )
+        return _build_stress_from_notices(notices)
+
+    stress_daily["stress_event"] = stress_daily["critical_active"].astype(int)
+    return stress_daily
 
 
 def build_model_frame(
@@ -119,52 +217,57 @@ def build_model_frame(
 
     Returns a DataFrame with daily rows and merged drivers + stress target.
     """
-    # --- Load drivers ---
-    weather = load_noaa_region_daily(
-        pipeline=cfg.pipeline,
-        start=cfg.start,
-        end=cfg.end,
-        region_id=cfg.noaa_region_id,
-        mongo_uri=mongo_uri,
-        mongo_db=mongo_db,
-    )
-    weather = _ensure_daily_index(weather, "date")
+    # --- Load drivers + operational signals ---
+    # The loaders are independent network-bound queries sharing one pooled
+    # client, so issue them concurrently.
+    with ThreadPoolExecutor(max_workers=5) as ex:
+        weather_f = ex.submit(
+            load_noaa_region_daily,
+            pipeline=cfg.pipeline,
+            start=cfg.start,
+            end=cfg.end,
+            region_id=cfg.noaa_region_id,
+            mongo_uri=mongo_uri,
+            mongo_db=mongo_db,
+        )
+        hh_f = ex.submit(
+            load_henry_hub_daily,
+            start=cfg.start,
+            end=cfg.end,
+            mongo_uri=mongo_uri,
+            mongo_db=mongo_db,
+        )
+        storage_f = ex.submit(
+            load_storage_weekly,
+            start=cfg.start,
+            end=cfg.end,
+            region="lower48",
+            mongo_uri=mongo_uri,
+            mongo_db=mongo_db,
+        )
+        stress_f = ex.submit(_load_stress_daily, cfg, mongo_uri, mongo_db)
+        # Capacity is usually “intraday snapshot style”; for the first model
+        # frame, you often don't need it unless you're deriving constraints vs
+        # normal. Only the fields behind the median feature are loaded; switch
+        # to load_capacity_df when adding features that need the full rows.
+        cap_f = ex.submit(
+            load_capacity_slim,
+            collection=cfg.capacity_collection,
+            start=cfg.start,
+            end=cfg.end,
+            mongo_uri=mongo_uri,
+            mongo_db=mongo_db,
+        )
+
+    weather = _ensure_daily_index(weather_f.result(), "date")
+    hh = _ensure_daily_index(hh_f.result(), "date")
 
-    hh = load_henry_hub_daily(
-        start=cfg.start, end=cfg.end, mongo_uri=mongo_uri, mongo_db=mongo_db
-    )
-    hh = _ensure_daily_index(hh, "date")
-
-    storage_w = load_storage_weekly(
-        start=cfg.start,
-        end=cfg.end,
-        region="lower48",
-        mongo_uri=mongo_uri,
-        mongo_db=mongo_db,
-    )
     # storage loader returns 'date' and 'working_gas_bcf'
-    storage_d = _weekly_to_daily_ffill(storage_w, "date", ["working_gas_bcf"])
-
-    # --- Load operational signals ---
-    notices = load_notices_df(
-        collection=cfg.notices_collection,
-        start=cfg.start,
-        end=cfg.end,
-        mongo_uri=mongo_uri,
-        mongo_db=mongo_db,
-    )
-    stress_daily = _build_stress_from_notices(notices)
-
-    # Capacity is usually “intraday snapshot style”; for the first model frame,
-    # you often don't need it unless you're deriving constraints vs normal.
-    # Still load it here so you can add features later.
-    cap = load_capacity_df(
-        collection=cfg.capacity_collection,
-        start=cfg.start,
-        end=cfg.end,
-        mongo_uri=mongo_uri,
-        mongo_db=mongo_db,
-    )
+    storage_d = _weekly_to_daily_ffill(storage_f.result(), "date", ["working_gas_bcf"])
+
+    stress_daily = stress_f.result()
+    cap = cap_f.result()
+
     # Example capacity feature: daily median All_Qty_Avail
     cap_feat = pd.DataFrame(columns=["date", "all_qty_avail_median"])
     if (
@@ -172,20 +275,15 @@ def build_model_frame(
         and "Post_Date_dt" in cap.columns
         and "All_Qty_Avail" in cap.columns
     ):
-        tmp = cap.copy()
-        tmp["date"] = pd.to_datetime(tmp["Post_Date_dt"], errors="coerce")
-        tmp["All_Qty_Avail"] = pd.to_numeric(tmp["All_Qty_Avail"], errors="coerce")
-        cap_feat = (
-            tmp.dropna(subset=["date"])
-            .groupby(tmp["date"].dt.floor("D"), as_index=False)
-            .agg(all_qty_avail_median=("All_Qty_Avail", "median"))
-            .rename(columns={"date": "date"})
-            .sort_values("date")
+        cap_feat = _daily_median(
+            pd.to_datetime(cap["Post_Date_dt"], errors="coerce"),
+            pd.to_numeric(cap["All_Qty_Avail"], errors="coerce"),
+            "all_qty_avail_median",
         )
 
     # --- Merge everything on daily date ---
     # Establish the daily calendar from weather (preferred) else HH else stress
-    base = weather[
+    df = weather[
         [
             "date",
             "pipeline",
@@ -195,14 +293,23 @@ def build_model_frame(
             "n_stations_used",
             "source",
         ]
-    ].copy()
-    base["date"] = pd.to_datetime(base["date"], errors="coerce")
+    ].reset_index(drop=True)
+    calendar = df["date"].to_numpy("datetime64[ns]")
 
-    df = base.merge(hh[["date", "henry_hub_usd_per_mmbtu"]], on="date", how="left")
+    # Every driver is sorted and unique per day, so a left join against the
+    # calendar is a binary search per day rather than a hash merge.
+    drivers = [(hh, ["henry_hub_usd_per_mmbtu"])]
     if not storage_d.empty:
-        df = df.merge(storage_d[["date", "working_gas_bcf"]], on="date", how="left")
-    df = df.merge(stress_daily, on="date", how="left")
-    df = df.merge(cap_feat, on="date", how="left")
+        drivers.append((storage_d, ["working_gas_bcf"]))
+    drivers.append(
+        (stress_daily, ["notice_active_count", "critical_active", "stress_event"])
+    )
+    drivers.append((cap_feat, ["all_qty_avail_median"]))
+
+    for frame, cols in drivers:
+        dates = frame["date"].to_numpy("datetime64[ns]")
+        for col in cols:
+            df[col] = _left_align(calendar, dates, frame[col].to_numpy(dtype=float))
 
     # Fill stress columns for days with no notices
     for col in ["notice_active_count", "critical_active", "stress_event"]:
@@ -8,21 +8,21 @@ def derive_forecast_inputs(df: pd.DataFrame) -> dict[str, float]:
     Derive x_* inputs for the volatility-risk forecast
     from the latest available model frame.
     """
-    d = df.sort_values("date").copy()
+    d = df.sort_values("date")
 
     if len(d) < 2:
         raise ValueError("Not enough data to derive forecast inputs")
 
-    x_op = d["stress_event"].rolling(3).mean().iloc[-1]
+    # Only the last value of each rolling window is used, so average the
+    # tail directly (short frames use whatever rows exist).
+    x_op = d["stress_event"].iloc[-3:].mean(skipna=False)
 
-    x_persist = d["hh_ret"].abs().rolling(3).mean().iloc[-1]
+    x_persist = d["hh_ret"].iloc[-3:].abs().mean(skipna=False)
 
     x_hdd = d["hdd_median"].iloc[-1]
 
-    x_storage = (
-        d["working_gas_bcf"].iloc[-1]
-        - d["working_gas_bcf"].rolling(365 * 3).mean().iloc[-1]
-    )
+    storage = d["working_gas_bcf"]
+    x_storage = storage.iloc[-1] - storage.iloc[-365 * 3 :].mean(skipna=False)
 
     return {
         "op": float(x_op),
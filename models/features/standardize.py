@@ -1,7 +1,26 @@
+import math
+
 import numpy as np
 import pandas as pd
 
 
+def nan_mean_std(x: np.ndarray) -> tuple[float, float]:
+    """
+    Mean and population std of the non-NaN values in x.
+
+    Uses one pass of running sums (sum, sum of squares) instead of
+    separate np.nanmean / np.nanstd scans.
+    """
+    x = x[~np.isnan(x)]
+    n = x.size
+    if n == 0:
+        return float("nan"), float("nan")
+
+    mean_ = float(x.sum()) / n
+    var = float(np.dot(x, x)) / n - mean_ * mean_
+    return mean_, math.sqrt(max(var, 0.0))
+
+
 def zscore(
     s: pd.Series,
     mean_: float | None = None,
@@ -20,10 +39,10 @@ def zscore(
     """
     x = s.to_numpy(dtype=float)
 
-    if mean_ is None:
-        mean_ = float(np.nanmean(x))
-    if std_ is None:
-        std_ = float(np.nanstd(x))
+    if mean_ is None or std_ is None:
+        fit_mean, fit_std = nan_mean_std(x)
+        mean_ = fit_mean if mean_ is None else mean_
+        std_ = fit_std if std_ is None else std_
 
     std_ = std_ if std_ > eps else 1.0
     z = (x - mean_) / std_
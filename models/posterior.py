@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+
+def _cache(idata) -> dict:
+    cache = getattr(idata, "_flat_cache", None)
+    if cache is None:
+        cache = {}
+        idata._flat_cache = cache
+    return cache
+
+
+def posterior_vars(idata) -> frozenset:
+    """Names of the posterior's data variables, cached like the draws."""
+    cache = _cache(idata)
+    names = cache.get("__vars__")
+    if names is None:
+        names = frozenset(idata.posterior.data_vars)
+        cache["__vars__"] = names
+    return names
+
+
+def flat_draws(idata, name: str, lower: float | None = None) -> np.ndarray:
+    """
+    Posterior draws of `name` flattened across chains as float64.
+
+    If `lower` is given, draws are clipped from below (e.g. StudentT nu).
+
+    Cached on the idata object so repeated forecasts against the same
+    posterior skip the xarray -> NumPy materialization. The returned array
+    is read-only; copy before mutating.
+    """
+    cache = _cache(idata)
+    key = name if lower is None else (name, float(lower))
+    arr = cache.get(key)
+    if arr is None:
+        if lower is None:
+            da = idata.posterior[name]
+            data = da.data
+            if not isinstance(data, np.ndarray):
+                data = da.values  # lazy (e.g. dask-backed): materialize once
+            arr = np.ascontiguousarray(data, dtype=float).reshape(-1)
+        else:
+            arr = np.maximum(flat_draws(idata, name), float(lower))
+        arr.flags.writeable = False
+        cache[key] = arr
+    return arr
+
+
+def stacked_draws(idata, names: Sequence[str]) -> np.ndarray:
+    """
+    (draws, len(names)) matrix of flattened posterior draws, cached per
+    name tuple. Read-only, like flat_draws.
+    """
+    cache = _cache(idata)
+    key = tuple(names)
+    B = cache.get(key)
+    if B is None:
+        B = np.stack([flat_draws(idata, n) for n in key], axis=1)
+        B.flags.writeable = False
+        cache[key] = B
+    return B
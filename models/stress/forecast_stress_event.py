@@ -3,6 +3,8 @@ from __future__ import annotations
 from typing import Dict, Optional, Tuple
 
 import numpy as np
+from models.posterior import flat_draws, stacked_draws
+from scipy.special import expit
 
 
 def _z(x: float, mean: float, std: float) -> float:
@@ -33,24 +35,30 @@ def forecast_stress_event_prob(
     """
     post = idata.posterior
 
-    a = post[intercept_name].values.reshape(-1).astype(float)
-    logit_p = a.copy()
+    a = flat_draws(idata, intercept_name)
 
-    for feat_name, feat_val_raw in x.items():
-        coef_name = f"{coef_prefix}{feat_name}"
-        if coef_name not in post:
-            continue
+    feat_names = [f for f in x if f"{coef_prefix}{f}" in post]
+    if not feat_names:
+        p_samp = expit(a)
+        return p_samp, float(np.mean(p_samp > prob_threshold))
 
-        b = post[coef_name].values.reshape(-1).astype(float)
-        feat_val = float(feat_val_raw)
+    # (draws, n_feat) coefficient matrix -> one GEMV instead of a Python
+    # loop of per-feature draws-sized temporaries.
+    B = stacked_draws(idata, [f"{coef_prefix}{f}" for f in feat_names])
+
+    xv = np.empty(len(feat_names), dtype=float)
+    for i, feat_name in enumerate(feat_names):
+        feat_val = float(x[feat_name])
 
         if scalers is not None and feat_name in scalers:
             mean = float(scalers[feat_name].get("mean", 0.0))
             std = float(scalers[feat_name].get("std", 1.0))
             feat_val = _z(feat_val, mean, std)
 
-        logit_p = logit_p + b * feat_val
+        xv[i] = feat_val
+
+    logit_p = a + B @ xv
 
-    p_samp = 1.0 / (1.0 + np.exp(-logit_p))
+    p_samp = expit(logit_p)
     prob_alert = float(np.mean(p_samp > prob_threshold))
     return p_samp, prob_alert
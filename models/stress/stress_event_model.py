@@ -17,14 +17,29 @@ def fit_stress_event_model(df: pd.DataFrame) -> tuple:
       - notice_active_count (optional)
       - all_qty_avail_median (optional)
     """
-    d = df.copy().sort_values("date")
-
-    if "stress_event" not in d.columns:
+    if "stress_event" not in df.columns:
         raise KeyError(
             "Missing 'stress_event' in model frame. "
             "Build it from notices (critical_active) or include op_stress."
         )
 
+    # Only the target and candidate predictors are needed; sort_values
+    # returns a new frame, so lag columns can be added without a full copy.
+    used = [
+        c
+        for c in (
+            "date",
+            "stress_event",
+            "hdd_median",
+            "hdd_mean",
+            "working_gas_bcf",
+            "all_qty_avail_median",
+            "notice_active_count",
+        )
+        if c in df.columns
+    ]
+    d = df[used].sort_values("date")
+
     # target
     d["y"] = d["stress_event"].astype(int)
 
@@ -57,7 +72,7 @@ def fit_stress_event_model(df: pd.DataFrame) -> tuple:
         )
 
     feature_cols = [name for name, _ in predictors]
-    d = d.dropna(subset=["y"] + feature_cols).copy()
+    d = d.dropna(subset=["y"] + feature_cols)
 
     y = d["y"].to_numpy(dtype=int)
 
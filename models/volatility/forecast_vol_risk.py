@@ -1,14 +1,151 @@
 from __future__ import annotations
 
-from typing import Dict, Optional, Tuple
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
 
 import numpy as np
+from models.posterior import flat_draws, posterior_vars, stacked_draws
 
+# Shared PCG64 generator; pass rng= to forecast_vol_risk for reproducibility.
+_RNG = np.random.default_rng()
 
-def _z(x: float, mean: float, std: float) -> float:
-    if std == 0 or np.isnan(std):
-        return 0.0
-    return float((x - mean) / std)
+
+@dataclass(frozen=True)
+class PreparedForecaster:
+    """
+    Posterior draws and scalers unpacked once for repeated forecasts.
+
+    Build with prepare_vol_forecaster(); feature vectors passed to
+    predict / predict_many are in `feat_names` order (raw, unscaled).
+    All arrays share one float dtype (float32 by default), which is also
+    the dtype of the predictive samples.
+    """
+
+    feat_names: Tuple[str, ...]
+    a: np.ndarray  # (draws,)
+    sigma: np.ndarray  # (draws,)
+    nu: np.ndarray  # (draws,)
+    B: np.ndarray  # (draws, n_feat)
+    mean: np.ndarray  # (n_feat,)
+    inv_std: np.ndarray  # (n_feat,)
+    const: np.ndarray  # (n_feat,) bool, zero/NaN std -> z = 0
+
+    @property
+    def dtype(self) -> np.dtype:
+        return self.a.dtype
+
+    def vector(self, x: Dict[str, float]) -> np.ndarray:
+        return np.array([float(x[f]) for f in self.feat_names], dtype=float)
+
+    def _scale(self, X: np.ndarray) -> np.ndarray:
+        Z = (np.asarray(X, dtype=self.dtype) - self.mean) * self.inv_std
+        Z[..., self.const] = 0.0
+        return Z
+
+    def predict(
+        self,
+        x_vec: np.ndarray,
+        *,
+        threshold: float = 0.02,
+        rng: np.random.Generator | None = None,
+    ) -> Tuple[np.ndarray, float]:
+        mu = self.a + self.B @ self._scale(x_vec)
+
+        # Accumulate in the t-draw buffer so no extra draws-sized
+        # temporaries are allocated.
+        rng = _RNG if rng is None else rng
+        y_samp = rng.standard_t(self.nu).astype(self.dtype, copy=False)
+        y_samp *= self.sigma
+        y_samp += mu
+
+        prob_exceed = np.count_nonzero(y_samp > threshold) / y_samp.size
+        return y_samp, prob_exceed
+
+    def predict_many(
+        self,
+        X: np.ndarray,
+        *,
+        threshold: float = 0.02,
+        rng: np.random.Generator | None = None,
+        out: np.ndarray | None = None,
+    ) -> np.ndarray:
+        """
+        P(y > threshold) for each row of X (K scenarios), via one GEMM.
+
+        Scenarios share the same t draws (common random numbers), so
+        differences between them are not Monte Carlo noise.
+
+        If `out` is given (shape (K, draws), forecaster dtype; e.g. an
+        np.memmap for large scenario sets) the predictive samples are
+        written there instead of a temporary.
+        """
+        Z = self._scale(np.atleast_2d(X))
+        Y = np.matmul(Z, self.B.T, out=out)  # (K, draws)
+        Y += self.a
+
+        rng = _RNG if rng is None else rng
+        eps = rng.standard_t(self.nu).astype(self.dtype, copy=False)
+        eps *= self.sigma
+        Y += eps
+
+        return np.count_nonzero(Y > threshold, axis=1) / Y.shape[1]
+
+
+def prepare_vol_forecaster(
+    idata,
+    feature_order: Sequence[str],
+    scalers: Optional[Dict[str, Dict[str, float]]] = None,
+    *,
+    intercept_name: str = "a",
+    sigma_name: str = "sigma",
+    nu_name: str = "nu",
+    coef_prefix: str = "b_",
+    min_nu: float = 2.1,
+    dtype: np.dtype = np.float32,
+) -> PreparedForecaster:
+    """
+    Unpack a fitted vol-risk posterior for repeated forecasting.
+
+    Draws are cast to `dtype` once here; float32 halves the memory and
+    bandwidth of the GEMV/GEMM and the samples, while tail probabilities
+    from a few thousand draws are unaffected at that precision.
+
+    Features without a `{coef_prefix}{name}` variable in the posterior are
+    dropped (see PreparedForecaster.feat_names).
+    """
+    vars_ = posterior_vars(idata)
+    feat_names = tuple(f for f in feature_order if f"{coef_prefix}{f}" in vars_)
+
+    n = len(feat_names)
+    mean = np.zeros(n, dtype=dtype)
+    inv_std = np.ones(n, dtype=dtype)
+    const = np.zeros(n, dtype=bool)
+    for i, f in enumerate(feat_names):
+        if scalers is not None and f in scalers:
+            m = float(scalers[f].get("mean", 0.0))
+            sd = float(scalers[f].get("std", 1.0))
+            if sd == 0 or np.isnan(sd):
+                const[i] = True
+            else:
+                mean[i], inv_std[i] = m, 1.0 / sd
+
+    if n:
+        # (draws, n_feat) coefficient matrix -> one GEMV for mu
+        B = stacked_draws(idata, [f"{coef_prefix}{f}" for f in feat_names])
+    else:
+        B = np.empty((flat_draws(idata, intercept_name).size, 0))
+
+    return PreparedForecaster(
+        feat_names=feat_names,
+        a=flat_draws(idata, intercept_name).astype(dtype, copy=False),
+        sigma=flat_draws(idata, sigma_name).astype(dtype, copy=False),
+        # Safety: avoid invalid t df (kept float64; only drives the t sampler)
+        nu=flat_draws(idata, nu_name, lower=min_nu),
+        B=B.astype(dtype, copy=False),
+        mean=mean,
+        inv_std=inv_std,
+        const=const,
+    )
 
 
 def forecast_vol_risk(
@@ -23,10 +160,15 @@ def forecast_vol_risk(
     nu_name: str = "nu",
     coef_prefix: str = "b_",
     min_nu: float = 2.1,
+    rng: np.random.Generator | None = None,
+    dtype: np.dtype = np.float64,
 ) -> Tuple[np.ndarray, float]:
     """
     One-step forecast from a fitted StudentT volatility-risk model.
 
+    For many forecasts against one posterior, build a PreparedForecaster
+    with prepare_vol_forecaster() once and call predict / predict_many.
+
     Returns
     -------
     y_samp: np.ndarray
@@ -34,37 +176,15 @@ def forecast_vol_risk(
     prob_exceed: float
         Monte Carlo estimate of P(y > threshold).
     """
-    post = idata.posterior
-    vars_ = set(post.data_vars)
-
-    # Flatten draws across chains
-    a = post[intercept_name].values.reshape(-1).astype(float)
-    sigma = post[sigma_name].values.reshape(-1).astype(float)
-    nu = post[nu_name].values.reshape(-1).astype(float)
-
-    # Safety: avoid invalid t df
-    nu = np.maximum(nu, float(min_nu))
-
-    mu = a.copy()
-
-    for feat_name, feat_val_raw in x.items():
-        coef_name = f"{coef_prefix}{feat_name}"
-        if coef_name not in vars_:
-            continue
-
-        b = post[coef_name].values.reshape(-1).astype(float)
-        feat_val = float(feat_val_raw)
-
-        if scalers is not None and feat_name in scalers:
-            mean = float(scalers[feat_name].get("mean", 0.0))
-            std = float(scalers[feat_name].get("std", 1.0))
-            feat_val = _z(feat_val, mean, std)
-
-        mu = mu + b * feat_val
-
-    # Sample predictive y per posterior draw
-    t = np.random.standard_t(df=nu, size=mu.shape[0])
-    y_samp = mu + sigma * t
-
-    prob_exceed = float(np.mean(y_samp > threshold))
-    return y_samp, prob_exceed
+    fc = prepare_vol_forecaster(
+        idata,
+        list(x),
+        scalers,
+        intercept_name=intercept_name,
+        sigma_name=sigma_name,
+        nu_name=nu_name,
+        coef_prefix=coef_prefix,
+        min_nu=min_nu,
+        dtype=dtype,
+    )
+    return fc.predict(fc.vector(x), threshold=threshold, rng=rng)
@@ -1,20 +1,94 @@
 from __future__ import annotations
 
+import importlib.util
+import os
+
 import numpy as np
 import pandas as pd
 import pymc as pm
+from models.features.standardize import nan_mean_std
+
+try:
+    import bottleneck as bn
+except Exception:  # pragma: no cover
+    bn = None
 
 
-def _zscore_series(s: pd.Series) -> tuple[np.ndarray, float, float]:
-    s = pd.to_numeric(s, errors="coerce")
-    mu = float(np.nanmean(s))
-    sd = float(np.nanstd(s, ddof=0))
+def _zscore_series(s: pd.Series | np.ndarray) -> tuple[np.ndarray, float, float]:
+    # own float64 buffer, standardized in place
+    x = np.array(pd.to_numeric(s, errors="coerce"), dtype=float)
+    mu, sd = nan_mean_std(x)
     if sd == 0 or np.isnan(sd):
-        return (np.zeros(len(s), dtype=float), mu, sd if not np.isnan(sd) else 1.0)
-    return ((s - mu) / sd).to_numpy(dtype=float), mu, sd
+        return (np.zeros(len(x), dtype=float), mu, sd if not np.isnan(sd) else 1.0)
+    np.subtract(x, mu, out=x)
+    np.divide(x, sd, out=x)
+    return x, mu, sd
+
+
+def _lag1(x: np.ndarray) -> np.ndarray:
+    out = np.empty(len(x), dtype=float)
+    out[:1] = np.nan
+    out[1:] = x[:-1]
+    return out
+
+
+def _rolling_sum_count(x: np.ndarray, window: int) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Trailing-window sum and non-NaN count via cumulative sums (one pass,
+    no pandas rolling object). NaNs are skipped, as in pandas rolling.
+    """
+    valid = ~np.isnan(x)
+    cs = np.concatenate(([0.0], np.cumsum(np.where(valid, x, 0.0))))
+    cn = np.concatenate(([0], np.cumsum(valid)))
+    hi = np.arange(1, len(x) + 1)
+    lo = np.maximum(hi - window, 0)
+    return cs[hi] - cs[lo], cn[hi] - cn[lo]
+
 
+def _rolling_mean(x: np.ndarray, window: int, min_periods: int = 1) -> np.ndarray:
+    if bn is not None:
+        return bn.move_mean(x, window=window, min_count=min_periods)
+    s, n = _rolling_sum_count(x, window)
+    return np.divide(s, n, out=np.full(len(x), np.nan), where=n >= min_periods)
 
-def fit_vol_risk_model(df: pd.DataFrame):
+
+def _rolling_count(flags: np.ndarray, window: int) -> np.ndarray:
+    """
+    Trailing-window count of a NaN-free 0/1 series: integer cumsum and one
+    shifted subtraction, no NaN masking.
+    """
+    cs = np.cumsum(flags, dtype=np.int32)
+    out = cs.copy()
+    out[window:] -= cs[:-window]
+    return out.astype(float)
+
+
+def _nuts_kwargs(chains: int) -> dict:
+    """
+    pm.sample kwargs for the fastest NUTS backend installed.
+
+    - numpyro: logp/grad JIT-compiled once by JAX; chains run one per device
+      ("parallel") when the host exposes enough JAX devices, otherwise vmap'd
+      in one process ("vectorized")
+    - numba: PyTensor graph compiled with Numba instead of the C backend
+    - otherwise PyMC defaults
+    """
+    if importlib.util.find_spec("numpyro") is not None:
+        import jax
+
+        parallel = (os.cpu_count() or 1) >= 4 and jax.local_device_count() >= chains
+        return {
+            "nuts_sampler": "numpyro",
+            "nuts_sampler_kwargs": {
+                "chain_method": "parallel" if parallel else "vectorized"
+            },
+        }
+    if importlib.util.find_spec("numba") is not None:
+        return {"compile_kwargs": {"mode": "NUMBA"}}
+    return {}
+
+
+def fit_vol_risk_model(df: pd.DataFrame, n_chains: int = 2, draws: int = 2000):
     """
     Target: next-day abs log return of Henry Hub proxy (abs(hh_ret)).
 
@@ -27,8 +101,11 @@ def fit_vol_risk_model(df: pd.DataFrame):
       - hdd_median or hdd_mean
       - working_gas_bcf
       - optional all_qty_avail_median, notice_active_count
+
+    Sampling defaults to 2 chains x 2000 draws: the same total draws as
+    4 x 1000, with half the total warmup.
     """
-    d = df.copy().sort_values("date").reset_index(drop=True)
+    d = df.sort_values("date", ignore_index=True)
 
     # --- Target: realized absolute return proxy ---
     if "hh_ret" not in d.columns:
@@ -42,17 +119,19 @@ def fit_vol_risk_model(df: pd.DataFrame):
     # --- Operational stress feature ---
     if "stress_event" in d.columns:
         d["op_stress"] = (
-            pd.to_numeric(d["stress_event"], errors="coerce").fillna(0).astype(int)
+            pd.to_numeric(d["stress_event"], errors="coerce").fillna(0).astype(np.int8)
         )
     elif "critical_active" in d.columns:
         d["op_stress"] = (
-            pd.to_numeric(d["critical_active"], errors="coerce").fillna(0).astype(int)
+            pd.to_numeric(d["critical_active"], errors="coerce")
+            .fillna(0)
+            .astype(np.int8)
         )
     else:
-        d["op_stress"] = 0
+        d["op_stress"] = np.int8(0)
 
     # Rolling stress persistence: count stress days in last 7 days
-    d["stress_days_7d"] = d["op_stress"].rolling(7, min_periods=1).sum()
+    d["stress_days_7d"] = _rolling_count(d["op_stress"].to_numpy(), 7)
 
     # --- Weather feature ---
     hdd_col = (
@@ -63,8 +142,8 @@ def fit_vol_risk_model(df: pd.DataFrame):
     if hdd_col is None:
         raise KeyError("fit_vol_risk_model requires hdd_median or hdd_mean in df.")
 
-    d["hdd_5d"] = (
-        pd.to_numeric(d[hdd_col], errors="coerce").rolling(5, min_periods=1).mean()
+    d["hdd_5d"] = _rolling_mean(
+        pd.to_numeric(d[hdd_col], errors="coerce").to_numpy(dtype=float), 5
     )
 
     # --- Storage feature ---
@@ -76,30 +155,29 @@ def fit_vol_risk_model(df: pd.DataFrame):
     # storage tightness proxy: negative z = tight if below mean (depends on interpretation)
     # keep as z so model sees relative level
     storage_z, storage_mu, storage_sd = _zscore_series(d["working_gas_bcf"])
-    d["storage_z"] = storage_z
 
     # --- Lag all predictors by 1 day (avoid lookahead) ---
-    d["op_stress_lag1"] = d["op_stress"].shift(1)
-    d["stress_days_7d_lag1"] = d["stress_days_7d"].shift(1)
-    d["hdd_5d_lag1"] = d["hdd_5d"].shift(1)
-    d["storage_z_lag1"] = pd.Series(d["storage_z"]).shift(1)
-
-    feat_cols = [
-        "op_stress_lag1",
-        "stress_days_7d_lag1",
-        "hdd_5d_lag1",
-        "storage_z_lag1",
-    ]
-    d = d.dropna(subset=["y"] + feat_cols).copy()
+    op_lag1 = _lag1(d["op_stress"].to_numpy(dtype=float))
+    persist_lag1 = _lag1(d["stress_days_7d"].to_numpy(dtype=float))
+    hdd_lag1 = _lag1(d["hdd_5d"].to_numpy(dtype=float))
+    storage_lag1 = _lag1(storage_z)
 
-    # --- Build design vectors (standardize continuous features) ---
-    X_op = d["op_stress_lag1"].to_numpy(dtype=float)
+    y = d["y"].to_numpy(dtype=float)
+    keep = ~(
+        np.isnan(y)
+        | np.isnan(op_lag1)
+        | np.isnan(persist_lag1)
+        | np.isnan(hdd_lag1)
+        | np.isnan(storage_lag1)
+    )
+    y = y[keep]
 
-    X_persist, mu_persist, sd_persist = _zscore_series(d["stress_days_7d_lag1"])
-    X_hdd, mu_hdd, sd_hdd = _zscore_series(d["hdd_5d_lag1"])
-    X_storage, mu_storage, sd_storage = _zscore_series(d["storage_z_lag1"])
+    # --- Build design vectors (standardize continuous features) ---
+    X_op = op_lag1[keep]
 
-    y = d["y"].to_numpy(dtype=float)
+    X_persist, mu_persist, sd_persist = _zscore_series(persist_lag1[keep])
+    X_hdd, mu_hdd, sd_hdd = _zscore_series(hdd_lag1[keep])
+    X_storage, mu_storage, sd_storage = _zscore_series(storage_lag1[keep])
 
     scalers = {
         "persist": {"mean": mu_persist, "std": sd_persist},
@@ -131,7 +209,12 @@ def fit_vol_risk_model(df: pd.DataFrame):
         pm.StudentT("y_obs", nu=nu, mu=mu, sigma=sigma, observed=y)
 
         idata = pm.sample(
-            tune=1000, draws=1000, target_accept=0.9, chains=4, progressbar=True
+            tune=1000,
+            draws=draws,
+            target_accept=0.9,
+            chains=n_chains,
+            progressbar=True,
+            **_nuts_kwargs(n_chains),
         )
 
     return m, idata, scalers
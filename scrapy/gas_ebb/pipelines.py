@@ -1,32 +1,62 @@
 from __future__ import annotations
 
+import inspect
 from datetime import datetime, timezone
 from typing import Any, Dict
 
 import pymongo
-from pymongo.errors import DuplicateKeyError
+from pymongo import InsertOne, UpdateOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
+from scrapy.utils.defer import deferred_from_coro
+
+try:
+    from pymongo import AsyncMongoClient
+except Exception:  # pragma: no cover
+    AsyncMongoClient = None
+
+
+async def _maybe_await(result):
+    # Async driver methods return coroutines; sync ones return the result.
+    if inspect.isawaitable(result):
+        return await result
+    return result
 
 
 class MongoPipeline:
     """
     Inserts Scrapy items into MongoDB.
     Supports optional upsert by a unique key, and adds metadata timestamps.
+    Writes are buffered and sent with bulk_write every `batch_size` items.
+
+    With USE_ASYNC_MONGO the asyncio driver is used, so flushes are awaited
+    on the reactor's event loop instead of blocking it.
     """
 
+    batch_size = 500
+
     def __init__(
         self,
         mongo_uri: str,
         mongo_db: str,
         mongo_collection: str,
         upsert_key: str | None,
+        batch_size: int | None = None,
+        use_async: bool = False,
     ):
         self.mongo_uri = mongo_uri
         self.mongo_db = mongo_db
         self.mongo_collection = mongo_collection
         self.upsert_key = upsert_key
+        if batch_size:
+            self.batch_size = int(batch_size)
+        self.use_async = bool(use_async) and AsyncMongoClient is not None
 
-        self.client: pymongo.MongoClient | None = None
-        self.collection: pymongo.collection.Collection | None = None
+        self.client: pymongo.MongoClient | AsyncMongoClient | None = None
+        self.collection = None
+        self._buffer: list[InsertOne | UpdateOne] = []
+        self._batch_now: str | None = None
+        self._unique_fields: list[str] | None = None
+        self._insert_only = False
 
     @classmethod
     def from_crawler(cls, crawler):
@@ -35,10 +65,18 @@ class MongoPipeline:
             mongo_db=crawler.settings.get("MONGO_DATABASE", "scrapy"),
             mongo_collection=crawler.settings.get("MONGO_COLLECTION", "items"),
             upsert_key=crawler.settings.get("MONGO_UPSERT_KEY"),  # optional
+            batch_size=crawler.settings.getint("MONGO_BATCH_SIZE", 0),
+            use_async=crawler.settings.getbool("USE_ASYNC_MONGO", False),
         )
 
     def open_spider(self, spider):
-        self.client = pymongo.MongoClient(self.mongo_uri)
+        return deferred_from_coro(self._open(spider))
+
+    async def _open(self, spider):
+        if self.use_async:
+            self.client = AsyncMongoClient(self.mongo_uri)
+        else:
+            self.client = pymongo.MongoClient(self.mongo_uri)
         db = self.client[self.mongo_db]
 
         # Per-spider override
@@ -53,7 +91,12 @@ class MongoPipeline:
         unique_fields = getattr(spider, "mongo_unique_fields", None)
         if unique_fields:
             index_spec = [(f, 1) for f in unique_fields]
-            self.collection.create_index(index_spec, unique=True)
+            await _maybe_await(self.collection.create_index(index_spec, unique=True))
+        self._unique_fields = list(unique_fields) if unique_fields else None
+
+        # Append-only feeds (snapshots keyed by post date) never change once
+        # written; only stamp last-seen on re-crawls instead of rewriting them.
+        self._insert_only = bool(getattr(spider, "mongo_insert_only", False))
 
         spider.logger.info(
             "Mongo collection set to '%s' for spider '%s'",
@@ -62,17 +105,46 @@ class MongoPipeline:
         )
 
     def close_spider(self, spider):
+        return deferred_from_coro(self._close(spider))
+
+    async def _close(self, spider):
+        await self._flush(spider)
         if self.client:
-            self.client.close()
+            await _maybe_await(self.client.close())
+
+    async def _flush(self, spider):
+        if self.collection is None or not self._buffer:
+            return
+
+        ops, self._buffer = self._buffer, []
+        self._batch_now = None
+        try:
+            await _maybe_await(self.collection.bulk_write(ops, ordered=False))
+        except BulkWriteError as e:
+            errors = e.details.get("writeErrors", [])
+            spider.logger.warning(
+                "Mongo bulk write: %d of %d ops failed (first: %s)",
+                len(errors),
+                len(ops),
+                errors[0].get("errmsg") if errors else None,
+            )
 
-    def process_item(self, item, spider):
+    async def _enqueue(self, op, spider):
+        self._buffer.append(op)
+        if len(self._buffer) >= self.batch_size:
+            await self._flush(spider)
+
+    async def process_item(self, item, spider):
         if self.collection is None:
             return item
 
         doc = dict(item)
-        now = datetime.now(timezone.utc).isoformat()
+        # One timestamp per write batch; items in a batch land together.
+        if self._batch_now is None:
+            self._batch_now = datetime.now(timezone.utc).isoformat()
+        now = self._batch_now
 
-        unique_fields = getattr(spider, "mongo_unique_fields", None)
+        unique_fields = self._unique_fields
 
         if unique_fields:
             missing = [f for f in unique_fields if f not in doc or doc[f] in (None, "")]
@@ -80,20 +152,23 @@ class MongoPipeline:
                 spider.logger.warning(
                     "Missing unique fields %s; inserting without dedupe", missing
                 )
-                self.collection.insert_one(doc)
+                await self._enqueue(InsertOne(doc), spider)
                 return item
 
             filt = {f: doc[f] for f in unique_fields}
-            self.collection.update_one(
-                filt,
-                {
+            if self._insert_only:
+                update = {
+                    "$setOnInsert": {**doc, "_meta.created_at_utc": now},
+                    "$set": {"_meta.last_seen_utc": now},
+                }
+            else:
+                update = {
                     "$set": doc,
                     "$setOnInsert": {"_meta.created_at_utc": now},
                     "$currentDate": {"_meta.updated_at": True},
-                },
-                upsert=True,
-            )
+                }
+            await self._enqueue(UpdateOne(filt, update, upsert=True), spider)
         else:
-            self.collection.insert_one(doc)
+            await self._enqueue(InsertOne(doc), spider)
 
         return item
@@ -1,3 +1,4 @@
+import codecs
 import csv
 import io
 from datetime import datetime, timezone
@@ -14,6 +15,7 @@ class AlgonquinCapacitySpider(scrapy.Spider):
     )
     mongo_collection = "ebb_algonquin_capacity"
     mongo_unique_fields = ["Loc_Name", "Post_Date", "TSP"]
+    mongo_insert_only = True
 
     def start_requests(self):
         yield scrapy.Request(self.start_url, callback=self.parse_page)
@@ -83,23 +85,25 @@ class AlgonquinCapacitySpider(scrapy.Spider):
 
         downloaded_at_utc = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
-        # Decode CSV bytes. If you ever see odd characters, switch to "utf-8-sig".
-        text = response.body.decode("utf-8", errors="replace")
+        # Decode CSV bytes line by line. If you ever see odd characters,
+        # switch to "utf-8-sig".
+        lines = codecs.iterdecode(io.BytesIO(response.body), "utf-8", errors="replace")
+        reader = csv.reader(lines)
 
-        # Use DictReader to map header -> value
-        reader = csv.DictReader(io.StringIO(text))
+        fieldnames = next(reader, None)
+        if not fieldnames:
+            return
 
         for row in reader:
-            # Optional: normalize whitespace
-            row = {k: (v.strip() if isinstance(v, str) else v) for k, v in row.items()}
+            if not row:
+                continue
 
-            item = CapacityItem()
-            item["source_url"] = response.url
-            item["downloaded_at_utc"] = downloaded_at_utc
+            item = CapacityItem(
+                source_url=response.url, downloaded_at_utc=downloaded_at_utc
+            )
 
-            # Assign all CSV columns that exist in the row
+            # Assign all CSV columns that exist in the row (whitespace stripped)
             # (This will work even if Enbridge adds/removes columns later)
-            for k, v in row.items():
-                item[k] = v
+            item.update(zip(fieldnames, map(str.strip, row)))
 
             yield item
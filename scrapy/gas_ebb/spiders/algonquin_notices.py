@@ -1,35 +1,132 @@
 from __future__ import annotations
 
-from datetime import datetime, timedelta
+from datetime import datetime, time, timedelta
 from typing import Optional
 
 import scrapy
 from gas_ebb.items import NoticeItem
+from lxml import etree, html
 from scrapy_splash import SplashRequest
 
 FORMAT_DATE_TIME_STRING = "%m/%d/%Y %I:%M:%S %p"
 
+# Compiled once per process and evaluated on response.selector.root
+# ('NoticeDetail' / 'NoticesDetail' both contain 'Notice').
+_XP_ROWS = etree.XPath("//tr[.//a[contains(@href, 'Notice')]]")
+_XP_POSTED = etree.XPath("normalize-space(.//td[2])")
+# Link in the second-to-last cell, else the row's first link: the second
+# branch only survives when the row has no link in that cell.
+_XP_HREF = etree.XPath(
+    "(.//td[last()-1]//a/@href"
+    " | .//a/@href[not(ancestor::tr[1]//td[last()-1]//a/@href)])[1]"
+)
+# id() is a hash lookup in libxml2's HTML documents; the contains() scan
+# over every div is only the fallback for prefixed ids (e.g. ASP.NET's
+# "ctl00_headingData").
+_XP_HEADING_ID = etree.XPath("id('headingData')[self::div]//text()")
+_XP_HEADING = etree.XPath('//div[contains(@id, "headingData")]//text()')
+_XP_BULLETIN = etree.XPath('//div[contains(@id, "bulletin")]')
+
+# Detail pages: render in Splash and return only the outerHTML of the
+# top-level headingData / bulletin divs, not the whole page.
+_DETAIL_LUA = """
+function main(splash, args)
+  splash.images_enabled = false
+  splash.resource_timeout = args.resource_timeout
+  assert(splash:go(args.url))
+  assert(splash:wait(args.wait))
+  return splash:evaljs([[
+    (function () {
+      function top(sel) {
+        return Array.from(document.querySelectorAll(sel))
+          .filter(function (e) {
+            return !(e.parentElement && e.parentElement.closest(sel));
+          })
+          .map(function (e) { return e.outerHTML; });
+      }
+      return {
+        heading: top('div[id*="headingData"]'),
+        bulletin: top('div[id*="bulletin"]'),
+      };
+    })()
+  ]])
+end
+"""
+
+
+def _fragment_root(fragments) -> etree._Element:
+    """Parse a list of outerHTML strings into one lxml document."""
+    if isinstance(fragments, dict):  # empty Lua table comes back as {}
+        fragments = list(fragments.values())
+    body = "".join(fragments or [])
+    return html.document_fromstring(f"<html><body>{body}</body></html>")
+
 
 def _clean_text_list(xs: list[str]) -> list[str]:
     """Strip whitespace and drop empty strings."""
-    out = []
-    for x in xs:
-        if x is None:
-            continue
-        s = x.strip()
-        if s:
-            out.append(s)
-    return out
+    return [s for s in (x.strip() for x in xs if x is not None) if s]
+
+
+def _to_html(el) -> str:
+    # Same serialization as parsel's Selector.get() for an element
+    return etree.tostring(el, method="html", encoding="unicode", with_tail=False)
 
 
 def _safe_get(xs: list[str], idx: int, default: str = "") -> str:
     return xs[idx] if 0 <= idx < len(xs) else default
 
 
+def _first(xs: list[str]) -> Optional[str]:
+    return str(xs[0]) if xs else None
+
+
 def _parse_dt(s: str) -> Optional[datetime]:
     s = (s or "").strip()
     if not s:
         return None
+    return _parse_dt_stripped(s)
+
+
+def _parse_dt_pair(xs: list[str], i: int, j: int) -> Optional[datetime]:
+    """
+    Parse the date at xs[i] plus the time at xs[j]. Entries come from
+    _clean_text_list, so they are already stripped and non-empty.
+    """
+    date_s = _safe_get(xs, i)
+    time_s = _safe_get(xs, j)
+    if date_s and time_s:
+        return _parse_dt_stripped(date_s + " " + time_s)
+    if date_s or time_s:
+        return _parse_dt_stripped(date_s or time_s)
+    return None
+
+
+def _parse_dt_stripped(s: str) -> Optional[datetime]:
+    # Fast path for the zero-padded form the EBB emits, "MM/DD/YYYY HH:MM:SS AM",
+    # by slicing; anything else goes through strptime as before.
+    if len(s) == 22 and s[2] == s[5] == "/" and s[10] == s[19] == " ":
+        digits = s[0:2] + s[3:5] + s[6:10] + s[11:13] + s[14:16] + s[17:19]
+        ampm = s[20:].upper()
+        if (
+            s[13] == s[16] == ":"
+            and digits.isascii()
+            and digits.isdigit()
+            and ampm in ("AM", "PM")
+        ):
+            hour = int(s[11:13])
+            if 1 <= hour <= 12:
+                try:
+                    return datetime(
+                        int(s[6:10]),
+                        int(s[0:2]),
+                        int(s[3:5]),
+                        hour % 12 + (12 if ampm == "PM" else 0),
+                        int(s[14:16]),
+                        int(s[17:19]),
+                    )
+                except ValueError:
+                    pass
+
     try:
         return datetime.strptime(s, FORMAT_DATE_TIME_STRING)
     except ValueError:
@@ -44,7 +141,8 @@ class AlgonquinNoticesSpider(scrapy.Spider):
     mongo_unique_fields = ["tsp", "notice_id", "posted_dt"]
 
     # Splash defaults (tune as needed)
-    splash_args = {"wait": 1.5, "timeout": 90}
+    splash_args = {"wait": 1.5, "timeout": 90, "images": 0, "resource_timeout": 10}
+    detail_splash_args = {**splash_args, "lua_source": _DETAIL_LUA}
 
     # ---- NEW: CLI-configurable cutoff ----
     # Run like:
@@ -97,10 +195,12 @@ class AlgonquinNoticesSpider(scrapy.Spider):
     def parse_list(self, response):
         # ---- UPDATED: use CLI-configured cutoff_days ----
         cutoff_date = datetime.now().date() - timedelta(days=self.cutoff_days)
+        # posted_dt.date() < cutoff_date  <=>  posted_dt < midnight of cutoff_date
+        cutoff_dt = datetime.combine(cutoff_date, time.min)
 
-        rows = response.xpath(
-            "//tr[.//a[contains(@href, 'NoticeDetail') or contains(@href, 'NoticesDetail') or contains(@href, 'Notice')]]"
-        )
+        # One query over the raw lxml tree; the per-row lookups below run on
+        # lxml elements directly, so no Selector is built per row/cell.
+        rows = _XP_ROWS(response.selector.root)
 
         self.logger.info(
             "list url=%s rows=%s cutoff_days=%s cutoff_date=%s",
@@ -111,19 +211,16 @@ class AlgonquinNoticesSpider(scrapy.Spider):
         )
 
         for row in rows:
-            posted_raw = row.xpath("normalize-space(.//td[2])").get()
-            posted_dt = _parse_dt(posted_raw)
+            posted_dt = _parse_dt(_XP_POSTED(row))
 
             if not posted_dt:
                 continue
 
-            if posted_dt.date() < cutoff_date:
+            if posted_dt < cutoff_dt:
                 # assumes list is newest-first; safe early stop
                 break
 
-            href = row.xpath(".//td[last()-1]//a/@href").get()
-            if not href:
-                href = row.xpath(".//a/@href").get()
+            href = _first(_XP_HREF(row))
 
             if not href:
                 continue
@@ -133,8 +230,8 @@ class AlgonquinNoticesSpider(scrapy.Spider):
             yield SplashRequest(
                 url=detail_url,
                 callback=self.parse_detail,
-                endpoint="render.html",
-                args=self.splash_args,
+                endpoint="execute",
+                args=self.detail_splash_args,
                 dont_filter=True,
                 meta={"posted_dt": posted_dt},
             )
@@ -144,9 +241,15 @@ class AlgonquinNoticesSpider(scrapy.Spider):
         notice["kind"] = "pipeline"
         notice["url"] = response.url
 
-        heading = _clean_text_list(
-            response.xpath('//div[contains(@id, "headingData")]//text()').getall()
-        )
+        data = getattr(response, "data", None)
+        if isinstance(data, dict):
+            # execute endpoint: only the extracted divs came back
+            root = _fragment_root(data.get("heading"))
+            bulletin_root = _fragment_root(data.get("bulletin"))
+        else:
+            root = bulletin_root = response.selector.root
+
+        heading = _clean_text_list(_XP_HEADING_ID(root) or _XP_HEADING(root))
 
         if len(heading) < 8:
             self.logger.warning(
@@ -160,28 +263,30 @@ class AlgonquinNoticesSpider(scrapy.Spider):
         critical_label = _safe_get(heading, 2).lower()
         notice["critical"] = "Y" if "critical" in critical_label else "N"
 
-        notice["effective_dt"] = _parse_dt(
-            f"{_safe_get(heading, 3)} {_safe_get(heading, 4)}"
-        )
-        notice["end_dt"] = _parse_dt(f"{_safe_get(heading, 5)} {_safe_get(heading, 6)}")
+        notice["effective_dt"] = _parse_dt_pair(heading, 3, 4)
+        notice["end_dt"] = _parse_dt_pair(heading, 5, 6)
 
         notice["status"] = _safe_get(heading, 8).lower()
         notice["type"] = _safe_get(heading, 9).lower()
 
-        posted_dt = _parse_dt(f"{_safe_get(heading, 10)} {_safe_get(heading, 11)}")
+        posted_dt = _parse_dt_pair(heading, 10, 11)
         notice["posted_dt"] = posted_dt or response.meta.get("posted_dt")
 
         notice["prior_id"] = _safe_get(heading, 12).strip()
 
         response_text = _safe_get(heading, 13)
         notice["response"] = response_text
-        response_dt = _parse_dt(f"{_safe_get(heading, 14)} {_safe_get(heading, 15)}")
+        response_dt = _parse_dt_pair(heading, 14, 15)
         if response_dt:
             notice["response_dt"] = response_dt
 
         notice["subject"] = _safe_get(heading, 16)
 
-        bulletin_html = response.xpath('//div[contains(@id, "bulletin")]').getall()
-        notice["body"] = "".join(bulletin_html).strip()
+        bulletins = _XP_BULLETIN(bulletin_root)
+        if len(bulletins) == 1:
+            body = _to_html(bulletins[0])
+        else:
+            body = "".join(_to_html(el) for el in bulletins)
+        notice["body"] = body.strip()
 
         yield notice
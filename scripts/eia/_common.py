@@ -0,0 +1,141 @@
+"""
+Helpers shared by the EIA fetch scripts: period parsing, CSV output and the
+pooled MongoClient / bulk upsert loop.
+"""
+
+from __future__ import annotations
+
+import atexit
+import functools
+import importlib.util
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List
+
+import pandas as pd
+
+try:
+    import bson
+    from pymongo import MongoClient, UpdateOne
+except Exception:  # pragma: no cover
+    bson = None
+    MongoClient = None
+    UpdateOne = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except Exception:  # pragma: no cover
+    pa = None
+    pa_csv = None
+
+# Wire compression only for codecs whose modules are installed
+_COMPRESSORS = ",".join(
+    name
+    for name, module in (("zstd", "zstandard"), ("snappy", "snappy"))
+    if importlib.util.find_spec(module) is not None
+)
+
+# (uri, db, collection) whose unique index was already ensured this process
+_ENSURED_INDEXES: set[tuple[str, str, str]] = set()
+
+# EIA `period` formats by string length (daily / monthly / annual)
+_PERIOD_FORMATS = {10: "%Y-%m-%d", 7: "%Y-%m", 4: "%Y"}
+
+
+def parse_period(period: pd.Series) -> pd.Series:
+    """
+    Parse EIA periods with an explicit format when they all share one
+    length, so pandas takes its vectorized path; otherwise infer per value.
+    """
+    period = period.astype(str)
+    lengths = period.str.len().unique()
+    fmt = _PERIOD_FORMATS.get(int(lengths[0])) if len(lengths) == 1 else None
+    return pd.to_datetime(period, format=fmt, errors="coerce", cache=True)
+
+
+def write_csv(df: pd.DataFrame, out_path: Path) -> None:
+    """Write with pyarrow's C++ CSV writer when installed, else pandas."""
+    if pa is None or pa_csv is None:
+        df.to_csv(out_path, index=False)
+        return
+
+    pa_csv.write_csv(
+        pa.Table.from_pandas(df, preserve_index=False),
+        str(out_path),
+        write_options=pa_csv.WriteOptions(quoting_style="needed"),
+    )
+
+
+@functools.lru_cache(maxsize=4)
+def get_client(uri: str) -> MongoClient:
+    """Shared, pooled MongoClient per URI; closed at interpreter exit."""
+    if not bson.has_c():
+        print("Warning: bson C extension not loaded; BSON encoding runs in Python.")
+    kwargs = {"compressors": _COMPRESSORS} if _COMPRESSORS else {}
+    client = MongoClient(uri, maxPoolSize=50, **kwargs)
+    atexit.register(client.close)
+    return client
+
+
+def upsert_series_docs(
+    *,
+    mongo_uri: str,
+    mongo_db: str,
+    mongo_collection: str,
+    columns: Dict[str, List[Any]],
+    source: Dict[str, str],
+    batch_size: int = 10_000,
+    id_keys: bool = False,
+    ensure_index: bool = False,
+) -> dict:
+    """
+    Upsert one document per row of `columns` (field -> values, which must
+    include "series" and "date") in unordered bulk batches.
+    """
+    if MongoClient is None or UpdateOne is None:
+        raise RuntimeError(
+            "pymongo is not installed. Install with: pip install pymongo"
+        )
+
+    col = get_client(mongo_uri)[mongo_db][mongo_collection]
+
+    # Unique key: (series, date). With id_keys the key is folded into _id,
+    # so upserts hit the primary index only; existing collections keyed by
+    # ObjectId must keep the default or they would get duplicate rows.
+    # The index is created at deploy time (ensure_index), not on every run.
+    index_key = (mongo_uri, mongo_db, mongo_collection)
+    if ensure_index and not id_keys and index_key not in _ENSURED_INDEXES:
+        col.create_index([("series", 1), ("date", 1)], unique=True)
+        _ENSURED_INDEXES.add(index_key)
+
+    ops = []
+    n_ops = 0
+    now = datetime.utcnow()
+
+    keys = list(columns)
+    for row in zip(*columns.values()):
+        doc = dict(zip(keys, row))
+        doc["updated_at_utc"] = now
+        doc["source"] = source
+
+        if id_keys:
+            filt = {"_id": f"{doc['series']}|{doc['date']}"}
+        else:
+            filt = {"series": doc["series"], "date": doc["date"]}
+        ops.append(UpdateOne(filt, {"$set": doc}, upsert=True))
+
+        if len(ops) >= batch_size:
+            res = col.bulk_write(ops, ordered=False)
+            n_ops += (res.upserted_count or 0) + (res.modified_count or 0)
+            ops = []
+
+    if ops:
+        res = col.bulk_write(ops, ordered=False)
+        n_ops += (res.upserted_count or 0) + (res.modified_count or 0)
+
+    return {
+        "mongo_db": mongo_db,
+        "collection": mongo_collection,
+        "upserts_or_updates": n_ops,
+    }
@@ -7,19 +7,17 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List
 
+import numpy as np
 import pandas as pd
+from _common import parse_period, upsert_series_docs, write_csv
 from dotenv import load_dotenv
 from eia_ng import EIAClient
 
-try:
-    from pymongo import MongoClient, UpdateOne
-except Exception:  # pragma: no cover
-    MongoClient = None
-    UpdateOne = None
-
-
 load_dotenv()
 
+# Shared by reference in every upserted document
+_SOURCE = {"provider": "EIA", "endpoint": "natural_gas.storage"}
+
 
 def _parse_args() -> argparse.Namespace:
     p = argparse.ArgumentParser(
@@ -63,11 +61,52 @@ def _parse_args() -> argparse.Namespace:
         help="Mongo collection for storage.",
     )
     p.add_argument(
-        "--mongo-batch-size", type=int, default=2000, help="Bulk upsert batch size."
+        "--mongo-batch-size",
+        type=int,
+        default=10_000,
+        help="Bulk upsert batch size (server splits at 100k ops / 48MB per batch).",
+    )
+    p.add_argument(
+        "--ensure-index",
+        type=int,
+        default=0,
+        help="1=create the unique (series, date) index (run once at deploy), "
+        "0=skip (default).",
+    )
+    p.add_argument(
+        "--mongo-id-keys",
+        type=int,
+        default=0,
+        help="1=upsert on a deterministic _id ('series|date') instead of the "
+        "(series, date) index; use for new collections only.",
     )
     return p.parse_args()
 
 
+# Fields read from each EIA row, and their DataFrame column names
+_EIA_FIELDS = (
+    "period",
+    "value",
+    "units",
+    "series",
+    "series-description",
+    "duoarea",
+    "area-name",
+    "product",
+    "product-name",
+    "process",
+    "process-name",
+)
+_RENAME = {
+    "period": "date",
+    "series-description": "series_description",
+    "area-name": "area_name",
+    "process-name": "process_name",
+    "product-name": "product_name",
+}
+_COLUMNS = [_RENAME.get(f, f) for f in _EIA_FIELDS]
+
+
 def _rows_to_df(rows: List[Dict[str, Any]], region: str) -> pd.DataFrame:
     """
     Expected row shape (from your example):
@@ -76,22 +115,16 @@ def _rows_to_df(rows: List[Dict[str, Any]], region: str) -> pd.DataFrame:
     if not rows:
         return pd.DataFrame()
 
-    df = pd.DataFrame(rows).copy()
-    df.rename(
-        columns={
-            "period": "date",
-            "series-description": "series_description",
-            "area-name": "area_name",
-            "process-name": "process_name",
-            "product-name": "product_name",
-        },
-        inplace=True,
-    )
+    missing = {"period", "value"} - rows[0].keys()
+    if missing:
+        raise ValueError(f"Unexpected schema. Columns: {list(rows[0])}")
 
-    if "date" not in df.columns or "value" not in df.columns:
-        raise ValueError(f"Unexpected schema. Columns: {list(df.columns)}")
+    # Only the fields we keep, positionally; absent fields become None
+    df = pd.DataFrame.from_records(
+        [tuple(r.get(f) for f in _EIA_FIELDS) for r in rows], columns=_COLUMNS
+    )
 
-    df["date"] = pd.to_datetime(df["date"], errors="coerce")
+    df["date"] = parse_period(df["date"])
     df = df.dropna(subset=["date"]).sort_values("date")
 
     df["value"] = pd.to_numeric(df["value"], errors="coerce")
@@ -100,7 +133,7 @@ def _rows_to_df(rows: List[Dict[str, Any]], region: str) -> pd.DataFrame:
     df["working_gas_bcf"] = df["value"]
     df["region"] = region
 
-    if "series" not in df.columns:
+    if df["series"].isna().all():
         df["series"] = "NW2_EPG0_SWO_R48_BCF"
 
     keep = [
@@ -117,12 +150,12 @@ def _rows_to_df(rows: List[Dict[str, Any]], region: str) -> pd.DataFrame:
         "process",
         "process_name",
     ]
-    for c in keep:
-        if c not in df.columns:
-            df[c] = pd.NA
-
-    df = df[keep].copy()
-    df["date"] = df["date"].dt.strftime("%Y-%m-%d")
+    df = df[keep]
+    # 'YYYY-MM-DD' strings (the Mongo loaders query dates as strings), via
+    # NumPy's C formatter rather than per-element strftime
+    df["date"] = np.datetime_as_string(
+        df["date"].to_numpy(dtype="datetime64[D]"), unit="D"
+    ).astype(object)
     return df
 
 
@@ -132,69 +165,41 @@ def mongo_upsert_storage(
     mongo_db: str,
     mongo_collection: str,
     df: pd.DataFrame,
-    batch_size: int = 2000,
+    batch_size: int = 10_000,
+    id_keys: bool = False,
+    ensure_index: bool = False,
 ) -> dict:
-    if MongoClient is None or UpdateOne is None:
-        raise RuntimeError(
-            "pymongo is not installed. Install with: pip install pymongo"
-        )
-
-    client = MongoClient(mongo_uri)
-    db = client[mongo_db]
-    col = db[mongo_collection]
-
-    # Unique key: (series, date)
-    col.create_index([("series", 1), ("date", 1)], unique=True)
-
-    ops = []
-    n_ops = 0
-    now = datetime.utcnow()
-
-    for rec in df.to_dict(orient="records"):
-        doc = {
-            "series": rec.get("series"),
-            "date": rec["date"],
-            "region": rec.get("region"),
-            "value": (
-                None
-                if pd.isna(rec.get("working_gas_bcf"))
-                else float(rec["working_gas_bcf"])
-            ),
-            "units": rec.get("units"),
-            "series_description": rec.get("series_description"),
-            "duoarea": rec.get("duoarea"),
-            "area_name": rec.get("area_name"),
-            "product": rec.get("product"),
-            "product_name": rec.get("product_name"),
-            "process": rec.get("process"),
-            "process_name": rec.get("process_name"),
-            "updated_at_utc": now,
-            "source": {"provider": "EIA", "endpoint": "natural_gas.storage"},
-        }
-
-        ops.append(
-            UpdateOne(
-                {"series": doc["series"], "date": doc["date"]},
-                {"$set": doc},
-                upsert=True,
-            )
-        )
-
-        if len(ops) >= batch_size:
-            res = col.bulk_write(ops, ordered=False)
-            n_ops += (res.upserted_count or 0) + (res.modified_count or 0)
-            ops = []
-
-    if ops:
-        res = col.bulk_write(ops, ordered=False)
-        n_ops += (res.upserted_count or 0) + (res.modified_count or 0)
-
-    client.close()
-    return {
-        "mongo_db": mongo_db,
-        "collection": mongo_collection,
-        "upserts_or_updates": n_ops,
+    # Column-wise: one NaN mask and one list per field instead of a dict
+    # per row from to_dict(orient="records").
+    value = df["working_gas_bcf"].to_numpy(dtype=float)
+    columns = {
+        "series": df["series"].tolist(),
+        "date": df["date"].tolist(),
+        "region": df["region"].tolist(),
+        "value": np.where(np.isnan(value), None, value).tolist(),
     }
+    for c in (
+        "units",
+        "series_description",
+        "duoarea",
+        "area_name",
+        "product",
+        "product_name",
+        "process",
+        "process_name",
+    ):
+        columns[c] = df[c].tolist()
+
+    return upsert_series_docs(
+        mongo_uri=mongo_uri,
+        mongo_db=mongo_db,
+        mongo_collection=mongo_collection,
+        columns=columns,
+        source=_SOURCE,
+        batch_size=batch_size,
+        id_keys=id_keys,
+        ensure_index=ensure_index,
+    )
 
 
 def main() -> None:
@@ -228,7 +233,7 @@ def main() -> None:
     if args.write_csv == 1:
         out_path = Path(args.out)
         out_path.parent.mkdir(parents=True, exist_ok=True)
-        df.to_csv(out_path, index=False)
+        write_csv(df, out_path)
         print(f"Wrote {len(df):,} rows to CSV: {out_path}")
 
     # Mongo
@@ -239,6 +244,8 @@ def main() -> None:
             mongo_collection=args.mongo_collection,
             df=df,
             batch_size=args.mongo_batch_size,
+            id_keys=args.mongo_id_keys == 1,
+            ensure_index=args.ensure_index == 1,
         )
         print("Mongo upsert:", result)
 
@@ -19,22 +19,41 @@ Optional:
 from __future__ import annotations
 
 import argparse
+import csv
+import io
 import json
 import os
+import shutil
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import asdict, dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, List, Optional
 
+import numpy as np
 import pandas as pd
 import requests
 from dotenv import load_dotenv
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Optional dependency
 try:
     from pymongo import MongoClient, UpdateOne
+    from pymongo.errors import PyMongoError
 except Exception:  # pragma: no cover
     MongoClient = None
     UpdateOne = None
+    PyMongoError = Exception
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+except Exception:  # pragma: no cover
+    pa = None
+    pa_csv = None
+
+_CSV_ENGINE = "c" if pa is None else "pyarrow"
 
 load_dotenv()
 
@@ -42,6 +61,9 @@ NOAA_GHCND_ACCESS_BASE = (
     "https://www.ncei.noaa.gov/data/global-historical-climatology-network-daily/access/"
 )
 
+# The only GHCND columns the normalization reads
+_STATION_COLUMNS = ("DATE", "TAVG", "TMIN", "TMAX")
+
 
 # -----------------------------
 # Data structures ("items")
@@ -61,98 +83,218 @@ class StationMetaItem:
 # -----------------------------
 
 
-def c_to_f(c: float) -> float:
+def c_to_f(c):
+    """Works on scalars, NumPy arrays and Series alike (NaN propagates)."""
     return (c * 9.0 / 5.0) + 32.0
 
 
-def compute_hdd_from_tavg_c(tavg_c: float, base_f: float = 65.0) -> float:
-    """HDD = max(0, baseF - TavgF)."""
-    tavg_f = c_to_f(tavg_c)
-    return max(0.0, base_f - tavg_f)
+def compute_hdd_from_tavg_c(tavg_c, base_f: float = 65.0):
+    """HDD = max(0, baseF - TavgF), vectorized; NaN in -> NaN out."""
+    return np.maximum(0.0, base_f - c_to_f(tavg_c))
+
+
+def iso_dates(days) -> np.ndarray:
+    """Epoch-day ints -> 'YYYY-MM-DD' strings (object array), formatted in C."""
+    return np.datetime_as_string(
+        np.asarray(days).astype("datetime64[D]"), unit="D"
+    ).astype(object)
+
+
+def write_csv(df: pd.DataFrame, path: str, append: bool = False) -> None:
+    """
+    Write with pyarrow's C++ CSV writer when installed, else pandas.
+    With append=True rows are added to an existing file without a header.
+    """
+    if pa is None or pa_csv is None:
+        df.to_csv(path, mode="a" if append else "w", header=not append, index=False)
+        return
+
+    with open(path, "ab" if append else "wb") as f:
+        pa_csv.write_csv(
+            pa.Table.from_pandas(df, preserve_index=False),
+            f,
+            write_options=pa_csv.WriteOptions(
+                include_header=not append, quoting_style="needed"
+            ),
+        )
 
 
 def safe_mkdir(path: str) -> None:
     os.makedirs(path, exist_ok=True)
 
 
-def download_station_csv(station_id: str, out_dir: str, timeout: int = 60) -> str:
+def make_session(pool_size: int = 32) -> requests.Session:
+    """Keep-alive session with a connection pool sized for concurrent downloads."""
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_size,
+        pool_maxsize=pool_size,
+        max_retries=Retry(total=3, backoff_factor=0.5),
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def download_station_csv(
+    station_id: str,
+    out_dir: str,
+    timeout: int = 60,
+    session: Optional[requests.Session] = None,
+    max_age: float = 3600.0,
+) -> str:
+    """
+    Fetch `{station_id}.csv` into out_dir and return its path.
+
+    A cached copy validated (downloaded or answered 304) within `max_age`
+    seconds is used without any request; older copies are revalidated with
+    a conditional GET. The validators sidecar's mtime records the last
+    validation.
+    """
     safe_mkdir(out_dir)
     url = f"{NOAA_GHCND_ACCESS_BASE}{station_id}.csv"
     out_path = os.path.join(out_dir, f"{station_id}.csv")
+    validators_path = out_path + ".http.json"
 
-    # simple cache
+    # Revalidate the cached copy with the validators NOAA sent for it
+    headers = {}
     if os.path.exists(out_path) and os.path.getsize(out_path) > 0:
-        return out_path
+        try:
+            if time.time() - os.path.getmtime(validators_path) < max_age:
+                return out_path
+        except OSError:
+            pass
+        try:
+            with open(validators_path, encoding="utf-8") as f:
+                validators = json.load(f)
+        except (OSError, ValueError):
+            validators = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+
+    http = session if session is not None else requests
+    with http.get(url, headers=headers, timeout=timeout, stream=True) as r:
+        if r.status_code == 304 and headers:
+            os.utime(validators_path)
+            return out_path
+        if r.status_code != 200:
+            raise RuntimeError(
+                f"Failed download {station_id}: HTTP {r.status_code} url={url}"
+            )
 
-    r = requests.get(url, timeout=timeout)
-    if r.status_code != 200:
-        raise RuntimeError(
-            f"Failed download {station_id}: HTTP {r.status_code} url={url}"
-        )
+        # Stream to a temp file so an interrupted transfer never lands in the cache
+        r.raw.decode_content = True
+        tmp_path = out_path + ".part"
+        with open(tmp_path, "wb") as f:
+            shutil.copyfileobj(r.raw, f)
+        os.replace(tmp_path, out_path)
 
-    with open(out_path, "wb") as f:
-        f.write(r.content)
+        validators = {
+            "etag": r.headers.get("ETag", ""),
+            "last_modified": r.headers.get("Last-Modified", ""),
+        }
+    with open(validators_path, "w", encoding="utf-8") as f:
+        json.dump(validators, f)
 
     return out_path
 
 
+def _window_csv(
+    filepath: str,
+    date_col: int,
+    start_ts: Optional[pd.Timestamp],
+    end_ts: Optional[pd.Timestamp],
+) -> io.BytesIO:
+    """
+    The station file cut down to the header plus rows inside the date window.
+
+    GHCND access files are ISO-dated and only STATION precedes DATE, so the
+    date can be split off the front of each line and compared as bytes;
+    out-of-window rows never reach the CSV parser.
+    """
+    lo = start_ts.strftime("%Y-%m-%d").encode() if start_ts is not None else b""
+    hi = end_ts.strftime("%Y-%m-%d").encode() if end_ts is not None else None
+
+    with open(filepath, "rb") as f:
+        buf = [f.readline()]
+        for line in f:
+            parts = line.split(b",", date_col + 1)
+            if len(parts) <= date_col:
+                continue  # blank or truncated line: no date, dropped anyway
+            day = parts[date_col].strip(b'"')
+            if day >= lo and (hi is None or day[:10] <= hi):
+                buf.append(line)
+    return io.BytesIO(b"".join(buf))
+
+
 def read_and_normalize_station_file(
     station_id: str,
     filepath: str,
-    start_date: Optional[str],
-    end_date: Optional[str],
+    start_ts: Optional[pd.Timestamp],
+    end_ts: Optional[pd.Timestamp],
 ) -> pd.DataFrame:
     """
     Normalize station data to:
       pipeline-independent fields: station_id, date, tavg_c, tmin_c, tmax_c, hdd
-    Temperatures are tenths of °C in the NOAA access files.
-    """
-    df = pd.read_csv(filepath)
+    Temperatures are tenths of °C in the NOAA access files. The date bounds
+    are parsed once by the caller and shared across stations.
 
-    if "DATE" not in df.columns:
+    `date` is an int32 day count since 1970-01-01; it is only turned into
+    'YYYY-MM-DD' strings (iso_dates) when written to CSV or Mongo.
+    """
+    # Prune to the needed columns at parse time; the header decides which exist
+    with open(filepath, newline="", encoding="utf-8") as f:
+        header = next(csv.reader(f), [])
+    if "DATE" not in header:
         raise ValueError(f"{station_id}: missing DATE column in {filepath}")
 
-    cols = ["DATE"]
-    for c in ("TAVG", "TMIN", "TMAX"):
-        if c in df.columns:
-            cols.append(c)
-    df = df[cols].copy()
+    usecols = [c for c in _STATION_COLUMNS if c in header]
+
+    # Narrow windows (e.g. --days_ago 7) would otherwise parse decades of
+    # history just to filter it away; drop those lines before parsing.
+    # Dates are still filtered exactly below.
+    source = filepath
+    date_col = header.index("DATE")
+    if (start_ts is not None or end_ts is not None) and date_col <= 1:
+        source = _window_csv(filepath, date_col, start_ts, end_ts)
+
+    df = pd.read_csv(source, engine=_CSV_ENGINE, usecols=usecols)
     df.rename(columns={"DATE": "date"}, inplace=True)
 
     df["date"] = pd.to_datetime(df["date"], errors="coerce")
     df = df.dropna(subset=["date"]).sort_values("date")
 
-    if start_date:
-        df = df[df["date"] >= pd.to_datetime(start_date)]
-    if end_date:
-        df = df[df["date"] <= pd.to_datetime(end_date)]
-
-    # Convert tenths °C -> °C
-    for col in ("TAVG", "TMIN", "TMAX"):
-        if col in df.columns:
-            df[col] = pd.to_numeric(df[col], errors="coerce") / 10.0
-
-    # Prefer TAVG; fallback to mean(TMIN, TMAX)
-    df["tavg_c"] = df["TAVG"] if "TAVG" in df.columns else pd.NA
-    df["tmin_c"] = df["TMIN"] if "TMIN" in df.columns else pd.NA
-    df["tmax_c"] = df["TMAX"] if "TMAX" in df.columns else pd.NA
-
-    mask_fill = df["tavg_c"].isna() & df["tmin_c"].notna() & df["tmax_c"].notna()
-    df.loc[mask_fill, "tavg_c"] = (
-        df.loc[mask_fill, "tmin_c"] + df.loc[mask_fill, "tmax_c"]
-    ) / 2.0
-
-    def _hdd(x):
-        if pd.isna(x):
-            return pd.NA
-        return compute_hdd_from_tavg_c(float(x), base_f=65.0)
-
-    df["hdd"] = df["tavg_c"].apply(_hdd)
-
-    df["ghcnd_station_id"] = station_id
-    df["date"] = df["date"].dt.strftime("%Y-%m-%d")
-
-    return df[["ghcnd_station_id", "date", "tavg_c", "tmin_c", "tmax_c", "hdd"]].copy()
+    if start_ts is not None:
+        df = df[df["date"] >= start_ts]
+    if end_ts is not None:
+        df = df[df["date"] <= end_ts]
+
+    # Convert tenths °C -> °C (absent columns are all-NaN)
+    def _celsius(col: str) -> np.ndarray:
+        if col not in df.columns:
+            return np.full(len(df), np.nan)
+        return pd.to_numeric(df[col], errors="coerce").to_numpy(dtype=float) / 10.0
+
+    tmin_c = _celsius("TMIN")
+    tmax_c = _celsius("TMAX")
+
+    # Prefer TAVG; fallback to mean(TMIN, TMAX). A NaN in either bound keeps
+    # the fallback NaN, so one np.where covers the whole rule.
+    tavg_c = _celsius("TAVG")
+    tavg_c = np.where(np.isnan(tavg_c), (tmin_c + tmax_c) / 2.0, tavg_c)
+
+    return pd.DataFrame(
+        {
+            "ghcnd_station_id": station_id,
+            "date": df["date"].to_numpy(dtype="datetime64[D]").astype(np.int32),
+            "tavg_c": tavg_c,
+            "tmin_c": tmin_c,
+            "tmax_c": tmax_c,
+            "hdd": compute_hdd_from_tavg_c(tavg_c, base_f=65.0),
+        }
+    )
 
 
 def aggregate_region_daily(
@@ -162,11 +304,14 @@ def aggregate_region_daily(
     Aggregate across stations by day.
     Outputs both median and mean. Median is recommended for robustness.
     """
-    df = df_all.copy()
-    for col in ("tavg_c", "hdd"):
-        df[col] = pd.to_numeric(df[col], errors="coerce")
-
-    df_valid = df.dropna(subset=["tavg_c"]).copy()
+    # Only the aggregated columns are copied; the frame may be the full
+    # station-normalized set or already narrowed by the caller.
+    df = df_all[["ghcnd_station_id", "date", "tavg_c", "hdd"]]
+    df = df.assign(
+        tavg_c=pd.to_numeric(df["tavg_c"], errors="coerce"),
+        hdd=pd.to_numeric(df["hdd"], errors="coerce"),
+    )
+    df_valid = df.dropna(subset=["tavg_c"])
 
     g = df_valid.groupby("date", as_index=False)
     agg = g.agg(
@@ -176,13 +321,10 @@ def aggregate_region_daily(
         hdd_median=("hdd", "median"),
         hdd_mean=("hdd", "mean"),
     ).sort_values("date")
+    agg["date"] = iso_dates(agg["date"])
 
-    agg["tavg_f_median"] = agg["tavg_c_median"].apply(
-        lambda x: c_to_f(float(x)) if pd.notna(x) else pd.NA
-    )
-    agg["tavg_f_mean"] = agg["tavg_c_mean"].apply(
-        lambda x: c_to_f(float(x)) if pd.notna(x) else pd.NA
-    )
+    agg["tavg_f_median"] = c_to_f(agg["tavg_c_median"])
+    agg["tavg_f_mean"] = c_to_f(agg["tavg_c_mean"])
 
     agg.insert(0, "pipeline", pipeline)
     agg.insert(1, "region_id", region_id)
@@ -218,33 +360,31 @@ def load_station_meta(csv_path: str, pipeline_filter: str) -> List[StationMetaIt
     if df.empty:
         raise ValueError(f"No stations found for pipeline == {pipeline_filter!r}")
 
-    items: List[StationMetaItem] = []
-    for _, r in df.iterrows():
-        items.append(
-            StationMetaItem(
-                pipeline=str(r["pipeline"]),
-                ghcnd_station_id=str(r["ghcnd_station_id"]),
-                station_name=(
-                    str(r["station_name"])
-                    if "station_name" in df.columns and pd.notna(r.get("station_name"))
-                    else None
-                ),
-                state=(
-                    str(r["state"])
-                    if "state" in df.columns and pd.notna(r.get("state"))
-                    else None
-                ),
-            )
-        )
+    # De-duplicate station ids (first row wins), then build items column-wise
+    df = df.drop_duplicates(subset=["ghcnd_station_id"], keep="first")
 
-    # De-duplicate station ids
-    seen = set()
-    out = []
-    for it in items:
-        if it.ghcnd_station_id not in seen:
-            out.append(it)
-            seen.add(it.ghcnd_station_id)
-    return out
+    def _optional(col: str) -> List[Optional[str]]:
+        if col not in df.columns:
+            return [None] * len(df)
+        return [
+            str(v) if present else None
+            for v, present in zip(df[col].tolist(), df[col].notna().tolist())
+        ]
+
+    return [
+        StationMetaItem(
+            pipeline=pipeline,
+            ghcnd_station_id=sid,
+            station_name=name,
+            state=state,
+        )
+        for pipeline, sid, name, state in zip(
+            df["pipeline"].tolist(),
+            df["ghcnd_station_id"].tolist(),
+            _optional("station_name"),
+            _optional("state"),
+        )
+    ]
 
 
 # -----------------------------
@@ -252,153 +392,239 @@ def load_station_meta(csv_path: str, pipeline_filter: str) -> List[StationMetaIt
 # -----------------------------
 
 
-def mongo_upsert_weather(
-    *,
-    mongo_uri: str,
-    mongo_db: str,
-    pipeline: str,
-    stations_meta: List[StationMetaItem],
-    df_station_norm: pd.DataFrame,
-    df_region_daily: pd.DataFrame,
-    station_collection: str,
-    region_collection: str,
-    batch_size: int = 2000,
-) -> Dict[str, Any]:
+def _float_or_none(s: pd.Series) -> list:
+    """Column as Python floats with NaN/NA mapped to None, in one pass."""
+    values = pd.to_numeric(s, errors="coerce").to_numpy(dtype=float)
+    return np.where(np.isnan(values), None, values).tolist()
+
+
+class WeatherMongoSink:
     """
-    Upsert station-day and region-day documents.
+    Upserts station-day and region-day documents.
 
     Station unique key: (pipeline, ghcnd_station_id, date)
     Region unique key:  (pipeline, region_id, date)
+
+    Station frames can be fed one at a time as they are normalized, so the
+    full station table never has to be held in memory; ops are buffered
+    across frames and written in unordered bulk batches.
+
+    Key fields are written from the filter on insert and the constant source
+    block via $setOnInsert, so updates to existing days only carry the
+    measurements (and station_meta, which follows edits to the stations CSV).
+
+    The client and indexes are only set up on the first write. A Mongo error
+    there or in any later write is printed as a warning and disables the
+    sink (see `error`), so the caller's CSV outputs are still produced.
     """
-    if MongoClient is None or UpdateOne is None:
-        raise RuntimeError(
-            "pymongo is not installed. Install with: pip install pymongo"
-        )
 
-    client = MongoClient(mongo_uri)
-    db = client[mongo_db]
-    col_station = db[station_collection]
-    col_region = db[region_collection]
+    def __init__(
+        self,
+        *,
+        mongo_uri: str,
+        mongo_db: str,
+        pipeline: str,
+        stations_meta: List[StationMetaItem],
+        station_collection: str,
+        region_collection: str,
+        batch_size: int = 10_000,
+    ) -> None:
+        if MongoClient is None or UpdateOne is None:
+            raise RuntimeError(
+                "pymongo is not installed. Install with: pip install pymongo"
+            )
 
-    # Ensure indexes (safe to call repeatedly)
-    col_station.create_index(
-        [("pipeline", 1), ("ghcnd_station_id", 1), ("date", 1)], unique=True
-    )
-    col_region.create_index(
-        [("pipeline", 1), ("region_id", 1), ("date", 1)], unique=True
-    )
+        self.mongo_uri = mongo_uri
+        self.mongo_db = mongo_db
+        self.pipeline = pipeline
+        self.station_collection = station_collection
+        self.region_collection = region_collection
+        self.batch_size = batch_size
+
+        self.client = None
+        self.col_station = None
+        self.col_region = None
+        self.error: Optional[Exception] = None
+
+        # Station meta map
+        self.meta_by_id = {s.ghcnd_station_id: asdict(s) for s in stations_meta}
 
-    # Station meta map
-    meta_by_id = {s.ghcnd_station_id: asdict(s) for s in stations_meta}
-
-    # Station documents
-    ops = []
-    station_upserts = 0
-    for rec in df_station_norm.to_dict(orient="records"):
-        sid = rec["ghcnd_station_id"]
-        doc = {
-            "pipeline": pipeline,
-            "ghcnd_station_id": sid,
-            "date": rec["date"],
-            "tavg_c": None if pd.isna(rec.get("tavg_c")) else float(rec["tavg_c"]),
-            "tmin_c": None if pd.isna(rec.get("tmin_c")) else float(rec["tmin_c"]),
-            "tmax_c": None if pd.isna(rec.get("tmax_c")) else float(rec["tmax_c"]),
-            "hdd": None if pd.isna(rec.get("hdd")) else float(rec["hdd"]),
-            "station_meta": meta_by_id.get(sid, {}),
-            "updated_at_utc": datetime.now(timezone.utc),
+        # Invariant across every document in this run
+        self.now_utc = datetime.now(timezone.utc)
+        self.on_insert = {
             "source": {
                 "provider": "NOAA",
                 "dataset": "GHCND",
                 "access_base": NOAA_GHCND_ACCESS_BASE,
-            },
+            }
         }
 
-        ops.append(
-            UpdateOne(
-                {"pipeline": pipeline, "ghcnd_station_id": sid, "date": rec["date"]},
-                {"$set": doc},
-                upsert=True,
-            )
+        # One op buffer, refilled in place between flushes
+        self._ops = [None] * batch_size
+        self._n_ops = 0
+        self.station_upserts = 0
+        self.region_upserts = 0
+
+    def _connect(self) -> None:
+        if self.client is not None:
+            return
+        self.client = MongoClient(self.mongo_uri)
+        db = self.client[self.mongo_db]
+        self.col_station = db[self.station_collection]
+        self.col_region = db[self.region_collection]
+
+        # Ensure indexes (safe to call repeatedly)
+        self.col_station.create_index(
+            [("pipeline", 1), ("ghcnd_station_id", 1), ("date", 1)], unique=True
+        )
+        self.col_region.create_index(
+            [("pipeline", 1), ("region_id", 1), ("date", 1)], unique=True
         )
 
-        if len(ops) >= batch_size:
-            res = col_station.bulk_write(ops, ordered=False)
-            station_upserts += (res.upserted_count or 0) + (res.modified_count or 0)
-            ops = []
-
-    if ops:
-        res = col_station.bulk_write(ops, ordered=False)
-        station_upserts += (res.upserted_count or 0) + (res.modified_count or 0)
-
-    # Region documents
-    ops = []
-    region_upserts = 0
-    for rec in df_region_daily.to_dict(orient="records"):
-        doc = {
-            "pipeline": rec["pipeline"],
-            "region_id": rec["region_id"],
-            "date": rec["date"],
-            "n_stations_used": int(rec["n_stations_used"]),
-            "tavg_c_median": (
-                None
-                if pd.isna(rec.get("tavg_c_median"))
-                else float(rec["tavg_c_median"])
-            ),
-            "tavg_f_median": (
-                None
-                if pd.isna(rec.get("tavg_f_median"))
-                else float(rec["tavg_f_median"])
-            ),
-            "hdd_median": (
-                None if pd.isna(rec.get("hdd_median")) else float(rec["hdd_median"])
+    def _flush(self, region: bool = False) -> int:
+        if not self._n_ops:
+            return 0
+        ops = self._ops if self._n_ops == self.batch_size else self._ops[: self._n_ops]
+        self._n_ops = 0
+        if self.error is not None:
+            return 0
+        try:
+            self._connect()
+            col = self.col_region if region else self.col_station
+            res = col.bulk_write(ops, ordered=False)
+        except PyMongoError as e:
+            self.error = e
+            print(f"WARNING: Mongo upsert failed, skipping the rest: {e}")
+            return 0
+        return (res.upserted_count or 0) + (res.modified_count or 0)
+
+    def add_station_frame(self, df_station_norm: pd.DataFrame) -> None:
+        """Queue one station-normalized frame (column-wise, no per-row dicts)."""
+        if self.error is not None:
+            return
+
+        pipeline = self.pipeline
+        meta_by_id = self.meta_by_id
+        now_utc = self.now_utc
+        on_insert = self.on_insert
+
+        for sid, date, tavg_c, tmin_c, tmax_c, hdd in zip(
+            df_station_norm["ghcnd_station_id"].tolist(),
+            iso_dates(df_station_norm["date"]).tolist(),
+            *(
+                _float_or_none(df_station_norm[c])
+                for c in ("tavg_c", "tmin_c", "tmax_c", "hdd")
             ),
-            "tavg_c_mean": (
-                None if pd.isna(rec.get("tavg_c_mean")) else float(rec["tavg_c_mean"])
-            ),
-            "tavg_f_mean": (
-                None if pd.isna(rec.get("tavg_f_mean")) else float(rec["tavg_f_mean"])
-            ),
-            "hdd_mean": (
-                None if pd.isna(rec.get("hdd_mean")) else float(rec["hdd_mean"])
-            ),
-            "updated_at_utc": datetime.now(timezone.utc),
-            "source": {
-                "provider": "NOAA",
-                "dataset": "GHCND",
-                "access_base": NOAA_GHCND_ACCESS_BASE,
-            },
+        ):
+            doc = {
+                "tavg_c": tavg_c,
+                "tmin_c": tmin_c,
+                "tmax_c": tmax_c,
+                "hdd": hdd,
+                "station_meta": meta_by_id.get(sid, {}),
+                "updated_at_utc": now_utc,
+            }
+
+            self._ops[self._n_ops] = UpdateOne(
+                {"pipeline": pipeline, "ghcnd_station_id": sid, "date": date},
+                {"$set": doc, "$setOnInsert": on_insert},
+                upsert=True,
+            )
+            self._n_ops += 1
+
+            if self._n_ops == self.batch_size:
+                self.station_upserts += self._flush()
+
+    def upsert_region(self, df_region_daily: pd.DataFrame) -> None:
+        """Write any queued station ops, then the region-day documents."""
+        self.station_upserts += self._flush()
+        if self.error is not None:
+            return
+
+        now_utc = self.now_utc
+        on_insert = self.on_insert
+        region_keys = (
+            df_region_daily["pipeline"].tolist(),
+            df_region_daily["region_id"].tolist(),
+            df_region_daily["date"].tolist(),
+        )
+        region_columns = {
+            "n_stations_used": df_region_daily["n_stations_used"]
+            .to_numpy(dtype="int64")
+            .tolist(),
         }
+        for c in (
+            "tavg_c_median",
+            "tavg_f_median",
+            "hdd_median",
+            "tavg_c_mean",
+            "tavg_f_mean",
+            "hdd_mean",
+        ):
+            region_columns[c] = _float_or_none(df_region_daily[c])
+
+        keys = list(region_columns)
+        for pipe, region, date, *row in zip(*region_keys, *region_columns.values()):
+            doc = dict(zip(keys, row))
+            doc["updated_at_utc"] = now_utc
 
-        ops.append(
-            UpdateOne(
-                {
-                    "pipeline": doc["pipeline"],
-                    "region_id": doc["region_id"],
-                    "date": doc["date"],
-                },
-                {"$set": doc},
+            self._ops[self._n_ops] = UpdateOne(
+                {"pipeline": pipe, "region_id": region, "date": date},
+                {"$set": doc, "$setOnInsert": on_insert},
                 upsert=True,
             )
-        )
+            self._n_ops += 1
 
-        if len(ops) >= batch_size:
-            res = col_region.bulk_write(ops, ordered=False)
-            region_upserts += (res.upserted_count or 0) + (res.modified_count or 0)
-            ops = []
+            if self._n_ops == self.batch_size:
+                self.region_upserts += self._flush(region=True)
 
-    if ops:
-        res = col_region.bulk_write(ops, ordered=False)
-        region_upserts += (res.upserted_count or 0) + (res.modified_count or 0)
+        self.region_upserts += self._flush(region=True)
 
-    client.close()
+    def close(self) -> Dict[str, Any]:
+        self.station_upserts += self._flush()
+        if self.client is not None:
+            self.client.close()
+
+        summary = {
+            "mongo_db": self.mongo_db,
+            "station_collection": self.station_collection,
+            "region_collection": self.region_collection,
+            "station_upserts_or_updates": self.station_upserts,
+            "region_upserts_or_updates": self.region_upserts,
+        }
+        if self.error is not None:
+            summary["error"] = str(self.error)
+        return summary
 
-    return {
-        "mongo_db": mongo_db,
-        "station_collection": station_collection,
-        "region_collection": region_collection,
-        "station_upserts_or_updates": station_upserts,
-        "region_upserts_or_updates": region_upserts,
-    }
+
+def mongo_upsert_weather(
+    *,
+    mongo_uri: str,
+    mongo_db: str,
+    pipeline: str,
+    stations_meta: List[StationMetaItem],
+    df_station_norm: pd.DataFrame,
+    df_region_daily: pd.DataFrame,
+    station_collection: str,
+    region_collection: str,
+    batch_size: int = 10_000,
+) -> Dict[str, Any]:
+    """One-shot WeatherMongoSink for an already materialized station table."""
+    sink = WeatherMongoSink(
+        mongo_uri=mongo_uri,
+        mongo_db=mongo_db,
+        pipeline=pipeline,
+        stations_meta=stations_meta,
+        station_collection=station_collection,
+        region_collection=region_collection,
+        batch_size=batch_size,
+    )
+    sink.add_station_frame(df_station_norm)
+    sink.upsert_region(df_region_daily)
+    summary = sink.close()
+    if sink.error is not None:
+        raise sink.error
+    return summary
 
 
 # -----------------------------
@@ -426,6 +652,16 @@ def main():
     )
     p.add_argument("--end", default=None, help="YYYY-MM-DD (optional)")
     p.add_argument("--timeout", type=int, default=60, help="HTTP timeout seconds")
+    p.add_argument(
+        "--workers", type=int, default=16, help="Concurrent station downloads"
+    )
+    p.add_argument(
+        "--cache-max-age",
+        type=float,
+        default=3600.0,
+        help="Seconds a validated station file is reused without revalidating "
+        "(0 always revalidates)",
+    )
 
     # Mongo options
     p.add_argument(
@@ -446,6 +682,12 @@ def main():
         default="noaa_region_daily",
         help="Collection for region-day docs",
     )
+    p.add_argument(
+        "--mongo-batch-size",
+        type=int,
+        default=10_000,
+        help="Bulk upsert batch size (server splits at 100k ops / 48MB per batch).",
+    )
 
     args = p.parse_args()
 
@@ -461,8 +703,11 @@ def main():
     safe_mkdir(station_dir)
     safe_mkdir(agg_dir)
 
-    frames = []
+    station_norm_path = os.path.join(agg_dir, f"{pipeline}_stations_normalized.csv")
+    region_path = os.path.join(agg_dir, f"{pipeline}_region_daily.csv")
+    meta_path = os.path.join(agg_dir, f"{pipeline}_region_daily.meta.json")
 
+    start_date = None
     if args.start:
         start_date = args.start
     elif args.days_ago > 0:
@@ -470,30 +715,80 @@ def main():
             "%Y-%m-%d"
         )
 
-    for st in stations:
-        fp = download_station_csv(
-            st.ghcnd_station_id, out_dir=station_dir, timeout=args.timeout
+    # Parsed once here rather than per station
+    start_ts = pd.to_datetime(start_date) if start_date else None
+    end_ts = pd.to_datetime(args.end) if args.end else None
+
+    # Downloads are network-bound: fetch concurrently over one pooled session
+    workers = max(1, args.workers)
+    with make_session(pool_size=2 * workers) as session:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            paths = list(
+                ex.map(
+                    lambda st: download_station_csv(
+                        st.ghcnd_station_id,
+                        out_dir=station_dir,
+                        timeout=args.timeout,
+                        session=session,
+                        max_age=args.cache_max_age,
+                    ),
+                    stations,
+                )
+            )
+
+    # Station rows are streamed to the normalized CSV (and Mongo, if set) as
+    # each file is read; only the aggregation's rows and columns are kept.
+    # Station ids become category codes against the (de-duplicated) station
+    # list, so concatenated frames share one codebook instead of repeating
+    # a Python str per row, and nunique counts small ints.
+    station_dtype = pd.CategoricalDtype([s.ghcnd_station_id for s in stations])
+    sink = None
+    if args.mongo_uri:
+        sink = WeatherMongoSink(
+            mongo_uri=args.mongo_uri,
+            mongo_db=args.mongo_db,
+            pipeline=pipeline,
+            stations_meta=stations,
+            station_collection=args.mongo_station_collection,
+            region_collection=args.mongo_region_collection,
+            batch_size=args.mongo_batch_size,
         )
+
+    agg_frames = []
+    for i, (st, fp) in enumerate(zip(stations, paths)):
         df_st = read_and_normalize_station_file(
             station_id=st.ghcnd_station_id,
             filepath=fp,
-            start_date=start_date,
-            end_date=args.end,
+            start_ts=start_ts,
+            end_ts=end_ts,
         )
-        frames.append(df_st)
-
-    df_all = pd.concat(frames, ignore_index=True)
+        df_st["ghcnd_station_id"] = pd.Categorical.from_codes(
+            np.full(len(df_st), i), dtype=station_dtype
+        )
+        write_csv(
+            df_st.assign(date=iso_dates(df_st["date"])),
+            station_norm_path,
+            append=i > 0,
+        )
+        agg_frames.append(
+            df_st.loc[
+                df_st["tavg_c"].notna(), ["ghcnd_station_id", "date", "tavg_c", "hdd"]
+            ]
+        )
+        if sink is not None:
+            sink.add_station_frame(df_st)
+        del df_st
 
     # 3) Aggregate daily region series
-    df_region = aggregate_region_daily(df_all, pipeline=pipeline, region_id=region_id)
+    df_region = aggregate_region_daily(
+        pd.concat(agg_frames, ignore_index=True),
+        pipeline=pipeline,
+        region_id=region_id,
+    )
+    del agg_frames
 
     # 4) Save outputs (CSV)
-    station_norm_path = os.path.join(agg_dir, f"{pipeline}_stations_normalized.csv")
-    region_path = os.path.join(agg_dir, f"{pipeline}_region_daily.csv")
-    meta_path = os.path.join(agg_dir, f"{pipeline}_region_daily.meta.json")
-
-    df_all.to_csv(station_norm_path, index=False)
-    df_region.to_csv(region_path, index=False)
+    write_csv(df_region, region_path)
 
     meta = {
         "pipeline": pipeline,
@@ -523,18 +818,9 @@ def main():
     print(f"Saved metadata:          {meta_path}")
 
     # 5) Optional Mongo write
-    if args.mongo_uri:
-        result = mongo_upsert_weather(
-            mongo_uri=args.mongo_uri,
-            mongo_db=args.mongo_db,
-            pipeline=pipeline,
-            stations_meta=stations,
-            df_station_norm=df_all,
-            df_region_daily=df_region,
-            station_collection=args.mongo_station_collection,
-            region_collection=args.mongo_region_collection,
-        )
-        print("Mongo upsert result:", result)
+    if sink is not None:
+        sink.upsert_region(df_region)
+        print("Mongo upsert result:", sink.close())
 
 
 if __name__ == "__main__":